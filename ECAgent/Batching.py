@@ -1,4 +1,5 @@
 import itertools as itt
+import numpy as np
 import statistics as stats
 
 from multiprocessing import Pool
@@ -123,18 +124,17 @@ class ParameterList:
         List[Dict[str, Any]]
             containing dictionaries describing all experiments to investigate.
         """
-        param_list = []
-        for key, value in self._parameters.items():
+        keys = tuple(self._parameters)
+        values = []
+        for value in self._parameters.values():
             if type(value) == str:  # Strings are iterable but we treat them as a single value
-                args = [(key, value)]
+                values.append((value,))
             else:
                 try:
-                    args = [(key, v) for v in value]
+                    values.append(tuple(value))
                 except TypeError:
-                    args = [(key, value)]
-            param_list.append(args)
-        result = [dict(kwargs) for kwargs in itt.product(*param_list)]
-        return result
+                    values.append((value,))
+        return [dict(zip(keys, combination)) for combination in itt.product(*values)]
 
 
 def _build_model_from_kwargs(model_cls: Type[Model], kwargs: dict) -> Model:
@@ -155,8 +155,74 @@ def _build_model_from_kwargs(model_cls: Type[Model], kwargs: dict) -> Model:
     return model_cls(**kwargs)
 
 
+def _run_model(model: Model, max_timesteps: int = maxsize):
+    """Executes ``model`` until it is marked as complete or ``max_timesteps`` is reached.
+
+    Parameters
+    ----------
+    model : Model
+        The model to run.
+    max_timesteps : int
+        The maximum number of steps to run the model for. Defaults to ``sys.maxsize``.
+    """
+    # Bind to locals so the loop doesn't repeat attribute lookups every timestep
+    is_running = model.is_running
+    systems = model.systems
+    execute_systems = systems.execute_systems
+    while is_running() and systems.timestep < max_timesteps:
+        execute_systems()
+
+
+class _PackedRecords:
+    """Wraps a list of ``int`` or ``float`` records that has been converted into a NumPy array. Arrays are pickled as a
+    single buffer which makes them much cheaper to send between processes than a list of Python objects.
+
+    Attributes
+    ----------
+    array : np.ndarray
+        The packed records.
+    """
+
+    __slots__ = ['array']
+
+    def __init__(self, array: np.ndarray):
+        self.array = array
+
+
+def _pack_records(records: Any) -> Any:
+    """Packs ``records`` into a ``_PackedRecords`` object if it is a list of only ``int`` or only ``float`` values.
+    Any other ``records`` are returned unchanged.
+
+    Parameters
+    ----------
+    records : Any
+        The records of a ``Collector``.
+
+    Returns
+    -------
+    Any
+        A ``_PackedRecords`` object or the unchanged ``records``.
+    """
+    if isinstance(records, list) and len(records) > 0:
+        record_type = type(records[0])
+        # Exact type checks so that e.g. bools or int subclasses aren't turned into plain ints when unpacked
+        if record_type in (int, float) and all(type(r) is record_type for r in records):
+            try:
+                return _PackedRecords(np.asarray(records, dtype=np.int64 if record_type is int else np.float64))
+            except OverflowError:  # ints too large for int64
+                pass
+    return records
+
+
+def _unpack_records(records: Any) -> Any:
+    """Converts records packed by ``_pack_records`` back into a ``list``. Any other ``records`` are returned unchanged.
+    """
+    return records.array.tolist() if isinstance(records, _PackedRecords) else records
+
+
 def _run_model_for_batch(model_cls: Type[Model], kwargs: dict, collectors: Optional[Union[str, Iterable[str]]] = None,
-                         max_timesteps: Optional[int] = maxsize) -> Union[None, Dict[str, List[Any]], List[Any]]:
+                         max_timesteps: Optional[int] = maxsize,
+                         pack: bool = False) -> Union[None, Dict[str, List[Any]], List[Any]]:
     """Builds and runs a model.
 
     Parameters
@@ -169,6 +235,9 @@ def _run_model_for_batch(model_cls: Type[Model], kwargs: dict, collectors: Optio
         The name of the collectors whose data will be returned. Defaults to ``None``.
     max_timesteps : Optional[int]
         The maximum number of steps to run the model for. Defaults to ``sys.maxsize``.
+    pack : bool
+        If ``True``, numeric records are packed using ``_pack_records`` so they can be sent to another process
+        cheaply. Use ``_unpack_records`` to restore them. Defaults to ``False``.
 
     Returns
     -------
@@ -176,15 +245,16 @@ def _run_model_for_batch(model_cls: Type[Model], kwargs: dict, collectors: Optio
         The data collected by the specified collectors (if any).
     """
     model = _build_model_from_kwargs(model_cls, kwargs)  # Build Model
-    while model.is_running() and model.systems.timestep < max_timesteps:  # Run Model
-        model.execute()
+    _run_model(model, max_timesteps)  # Run Model
+
+    convert = _pack_records if pack else (lambda records: records)
 
     if collectors is None:  # No Data Collection
         return None
     elif type(collectors) == str:  # In the case of one collector
-        return model.systems[collectors].records
+        return convert(model.systems[collectors].records)
     else:  # Collector is an Iterable
-        return {model.systems[collector].id: model.systems[collector].records for collector in collectors}
+        return {model.systems[collector].id: convert(model.systems[collector].records) for collector in collectors}
 
 
 # Batch Run
@@ -284,10 +354,15 @@ def batch_run(model_cls: Type[Model], parameters: Union[ParameterList, Dict[str,
             if data is not None:
                 results.append(data)
     else:
+        # Send runs to the workers in chunks to reduce the number of IPC round trips.
+        chunksize = max(1, len(skwargs_with_repetition) // (processes * 4))
         with Pool(processes) as pool:
-            for data in pool.imap_unordered(run_model, skwargs_with_repetition):
-                if data is not None:
-                    results.append(data)
+            for data in pool.imap_unordered(partial(run_model, pack=True), skwargs_with_repetition,
+                                            chunksize=chunksize):
+                if isinstance(data, dict):
+                    results.append({key: _unpack_records(records) for key, records in data.items()})
+                elif data is not None:
+                    results.append(_unpack_records(data))
 
     return results
 
@@ -343,8 +418,7 @@ def _run_model_for_search(model_cls: Type[Model], score_func: Callable[[Model],
     records = []
     for _ in range(repetitions):  # For each repetition
         model = _build_model_from_kwargs(model_cls, parameters)  # Build Model
-        while model.is_running() and model.systems.timestep < max_timesteps:  # Run Model
-            model.execute()
+        _run_model(model, max_timesteps)  # Run Model
 
         records.append(score_func(model))  # Add result to records
 
@@ -371,17 +445,49 @@ def _score_model_for_search(records: Iterable[float], mode: ScoreMode) -> float:
     ------
     ValueError
         If invalid ``ScoreMode`` value is used.
+    statistics.StatisticsError
+        If a variance ``ScoreMode`` is used and there are fewer than two records.
+    """
+    return _score_models_for_search(np.asarray([list(records)]), mode).tolist()[0]
+
+
+def _score_models_for_search(records: np.ndarray, mode: ScoreMode) -> np.ndarray:
+    """Returns the final scores for multiple sets of records at once.
+
+    Parameters
+    ----------
+    records : np.ndarray
+        A 2D array of shape ``(parameter_sets, repetitions)`` containing the values to evaluate.
+    mode : ScoreMode
+        Which type of score to apply.
+
+    Returns
+    -------
+    np.ndarray
+        A 1D array containing the final score obtained by each set of records. Sums of integer records are exact and
+        are returned in an array of Python ``int``s.
+
+    Raises
+    ------
+    ValueError
+        If invalid ``ScoreMode`` value is used.
+    statistics.StatisticsError
+        If a variance ``ScoreMode`` is used and there are fewer than two records per set.
     """
     if mode == ScoreMode.MIN:
-        return min(records)
+        return records.min(axis=1)
     elif mode == ScoreMode.MAX:
-        return max(records)
+        return records.max(axis=1)
     elif mode == ScoreMode.MIN_MEAN or mode == ScoreMode.MAX_MEAN:
-        return stats.mean(records)
+        return records.mean(axis=1)
     elif mode == ScoreMode.MIN_SUM or mode == ScoreMode.MAX_SUM:
-        return sum(records)
+        if records.dtype.kind in 'iu':  # Sum integers as Python ints so that large sums can't overflow
+            return records.astype(object).sum(axis=1)
+        return records.sum(axis=1)
     elif mode == ScoreMode.MIN_VARIANCE or mode == ScoreMode.MAX_VARIANCE:
-        return stats.variance(records)
+        if records.shape[1] < 2:
+            raise stats.StatisticsError('variance requires at least two data points')
+        return records.var(axis=1, ddof=1)  # Sample variance
 
     raise ValueError(f"Invalid value of {mode} mode chosen. Value must come from ScoreMode.")
 
@@ -483,11 +589,17 @@ def grid_search(model_cls: Type[Model], parameters: Union[ParameterList, Dict[st
 
     # Calculate best result
     is_min = mode % 2 == 0  # Note: May not work in future if more search modes are added that aren't min-max searches
-    index = -1
-    target_score = maxsize if is_min else -maxsize
-    for i, result in enumerate(results):
-        result['score'] = _score_model_for_search(result['records'], mode)
-        if (is_min and result['score'] < target_score) or (not is_min and result['score'] > target_score):
-            index, target_score = i, result['score']
-
+    # Integer records are kept as integers so that their sums are exact
+    scores = _score_models_for_search(np.asarray([result['records'] for result in results]), mode)
+    for result, score in zip(results, scores.tolist()):
+        result['score'] = score
+
+    # First occurrence wins ties. NaN scores are never chosen and, if every score is NaN, the last result is returned.
+    if scores.dtype.kind == 'f':
+        if np.isnan(scores).all():
+            index = -1
+        else:
+            index = int(np.nanargmin(scores) if is_min else np.nanargmax(scores))
+    else:
+        index = int(scores.argmin() if is_min else scores.argmax())
     return results[index], results  # Return best parameter and summary of all results.
@@ -1,7 +1,71 @@
+import numpy as np
+
 from sys import maxsize
 from ECAgent.Core import System, Model
 
 
+class RecordBuffer:
+    """A list-like container for numeric records that is backed by a preallocated NumPy array.
+
+    Appending to a ``RecordBuffer`` writes into the array instead of creating a new Python object for every record. When
+    the array is full, its capacity is doubled. Use ``Collector.preallocate()`` to make a collector store its records in
+    a ``RecordBuffer``::
+
+        collector.preallocate(1000, dtype=np.int64)
+        collector.records.append(10)
+        collector.records.array  # Returns a NumPy array containing the records.
+
+    Attributes
+    ----------
+    array : np.ndarray
+        A view of the records stored in the buffer.
+    """
+
+    __slots__ = ['_data', '_size']
+
+    def __init__(self, capacity: int = 16, dtype=np.float64):
+        self._data = np.empty(max(capacity, 1), dtype=dtype)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, item):
+        return self.array[item]
+
+    def __iter__(self):
+        return iter(self.array)
+
+    def __getstate__(self):
+        # Only pickle the records, not the unused capacity
+        return (self.array.copy(),)
+
+    def __setstate__(self, state):
+        self._data = state[0]
+        self._size = len(self._data)
+
+    @property
+    def array(self) -> np.ndarray:
+        return self._data[:self._size]
+
+    def append(self, value):
+        """Adds ``value`` to the end of the buffer."""
+        if self._size == len(self._data):
+            data = np.empty(len(self._data) * 2, dtype=self._data.dtype)
+            data[:self._size] = self._data
+            self._data = data
+        self._data[self._size] = value
+        self._size += 1
+
+    def clear(self):
+        """Removes all records from the buffer. The buffer's capacity is kept."""
+        self._size = 0
+
+    def tolist(self) -> list:
+        """Returns the records as a list of Python objects."""
+        return self.array.tolist()
+
+
 class Collector(System):
     """ This is the Collector base class. Collectors are, by default, Systems and behave the same way.
      The collector base class adds a 'records' list property. This property holds all of the data collected
@@ -9,11 +73,16 @@ class Collector(System):
      When writing your own collector, override the collect() method not the execute() method. The Collector base
      class automatically calls the collect() method whenever the execute() method is called. If you do need to override
      the execute method, make sure you also call the collect() method to follow the intended behaviour of a Collector
-     object."""
-    def __init__(self, id: str, model: Model, priority=-1, frequency=1, start=0, end=maxsize):
+     object.
+     If the collector records a single number per collection, supply a NumPy dtype (e.g. dtype=np.int32) to store the
+     records in a RecordBuffer instead of a list."""
+
+    __slots__ = ['records']
+
+    def __init__(self, id: str, model: Model, priority=-1, frequency=1, start=0, end=maxsize, dtype=None):
         super().__init__(id, model, priority, frequency, start, end)
 
-        self.records = []
+        self.records = [] if dtype is None else RecordBuffer(dtype=dtype)
 
     def execute(self):
         """ This overrides the Systems base execution method. It simply calls the collect method"""
@@ -24,6 +93,21 @@ class Collector(System):
         Collector."""
         pass
 
+    def preallocate(self, size: int, dtype=np.float64):
+        """Replaces the collector's records with an empty ``RecordBuffer`` that has space for ``size`` records.
+
+        This is useful for collectors that record a single number per timestep. If the number of timesteps is known in
+        advance, the records can be stored without any per-record allocations.
+
+        Parameters
+        ----------
+        size : int
+            The number of records to allocate space for.
+        dtype : Optional
+            The NumPy dtype of the records. Defaults to ``np.float64``.
+        """
+        self.records = RecordBuffer(size, dtype)
+
 
 class AgentCollector(Collector):
     """This is a collector system specifically designed to iterate through every iteration whenever the system is
@@ -46,15 +130,33 @@ class AgentCollector(Collector):
             return {}
 
     The dict returned is then used to update the dict of that record. Returning None will not update the dict.
-    To see the agent collector in action, see the Environment and Data Collection tutorial."""
+    To see the agent collector in action, see the Environment and Data Collection tutorial.
+
+    If vectorized is True, the agentFunc is called once per collection with a list of all of the agents in the
+    environment and must return one result per agent (in the same order). This lets the agentFunc compute its results
+    with NumPy (or a Numba kernel) instead of being called once for every agent:
+        def myVectorizedCollectionFunc(agents):
+            return np.array([a[MoneyComponent].wealth for a in agents]) * 2
+
+    Storing one dict entry per agent every timestep is the slow path for large populations. If columnar is also True,
+    each record stores the agent ids and the agentFunc's results as two NumPy arrays instead, under the 'ids' and
+    'values' keys, so no per-agent dict entries are created. Unlike the dict path, None results are not skipped:
+        collector.records[0]['values'][collector.records[0]['ids'] == 'a1']"""
+
+    __slots__ = ['agentFunc', 'compositeFunc', 'includeTimestep', 'vectorized', 'columnar']
 
     def __init__(self, model: Model, agentFunc, compositeFunc=None, includeTimstep=False, id="AgentCollector",
-                 priority=-1, frequency=1, start=0, end=maxsize):
+                 priority=-1, frequency=1, start=0, end=maxsize, vectorized=False, columnar=False):
         super().__init__(id, model, priority, frequency, start, end)
 
+        if columnar and not vectorized:
+            raise ValueError('A columnar AgentCollector requires a vectorized agentFunc.')
+
         self.agentFunc = agentFunc
         self.compositeFunc = compositeFunc
         self.includeTimestep = includeTimstep
+        self.vectorized = vectorized
+        self.columnar = columnar
 
     def collect(self):
         """ The AgentCollector Collect() function iterates through every agent, a, in the model.environments.agents dict
@@ -63,7 +165,21 @@ class AgentCollector(Collector):
         value of the current timestep in the tmpDict.
         After calling agentFunc(a) for all agents, the compositeFunc is called and supplied with a dict of all agents.
         The dict returned from the compositeFunc(agents) operation is then used to update the tmpDict.
-        A record will not be appended to the records list if the tmpDict is empty."""
+        A record will not be appended to the records list if the tmpDict is empty. If agentFunc is None, only the
+        timestep and the compositeFunc's results are recorded.
+
+        Raises
+        ------
+        ValueError
+            If the AgentCollector is vectorized and the agentFunc doesn't return exactly one result per agent.
+        """
+
+        agents = self.model.environment.agents
+        agentFunc = self.agentFunc
+
+        # Nothing could be recorded so return before creating the record
+        if not self.includeTimestep and self.compositeFunc is None and (not agents or agentFunc is None):
+            return
 
         # Create Empty record
         tmpDict = {}
@@ -72,17 +188,38 @@ class AgentCollector(Collector):
         if self.includeTimestep:
             tmpDict['timestep'] = self.model.systems.timestep
 
-        # Loop through all agents in the environment
-        for agentKey in self.model.environment.agents:
-            result = self.agentFunc(self.model.environment.agents[agentKey])
-
-            # If the result from the agentFunc is not None, add result to the dict
-            if result is not None:
-                tmpDict[agentKey] = result
+        if agents and agentFunc is not None:
+            if self.columnar:
+                # Store the results as-is alongside the ids instead of creating a dict entry for every agent
+                values = np.asarray(agentFunc(list(agents.values())))
+                if values.shape[:1] != (len(agents),):
+                    raise ValueError(f'The agentFunc returned {len(values) if values.ndim else 0} results for '
+                                     f'{len(agents)} agents.')
+                tmpDict['ids'] = np.array(list(agents))
+                tmpDict['values'] = values
+            elif self.vectorized:
+                # Call agentFunc once for all agents. NumPy results are converted back to Python objects in one go.
+                results = agentFunc(list(agents.values()))
+                if isinstance(results, np.ndarray):
+                    results = results.tolist()
+                if len(results) != len(agents):
+                    raise ValueError(f'The agentFunc returned {len(results)} results for {len(agents)} agents.')
+
+                for agentKey, result in zip(agents, results):
+                    if result is not None:
+                        tmpDict[agentKey] = result
+            else:
+                # Loop through all agents in the environment
+                for agentKey, agent in agents.items():
+                    result = agentFunc(agent)
+
+                    # If the result from the agentFunc is not None, add result to the dict
+                    if result is not None:
+                        tmpDict[agentKey] = result
 
         # Call compositeFunc
         if self.compositeFunc is not None:
-            comp_result = self.compositeFunc(self.model.environment.agents)
+            comp_result = self.compositeFunc(agents)
 
             # Add comp_result to lambda if not None
             if comp_result is not None:
@@ -98,11 +235,15 @@ class FileCollector(Collector):
     records of the collector to the specified file name.
     When implementing your own FileCollector, you may need to override two methods:
     - The collect() method (As you would if you were writing your own non file-based collector).
-    - The write_records() method which describes how your collector writes content to a file."""
+    - The write_records() method which describes how your collector writes content to a file.
+    If a dtype is supplied, the records are kept in a RecordBuffer and written to the file as raw binary data (see
+    numpy.ndarray.tofile), so the filemode should be a binary one like 'ab'."""
+
+    __slots__ = ['filename', 'filemode', 'write_count', 'last_write', 'clear_records_on_write']
 
     def __init__(self, id: str, model: Model, filename: str, priority=-1, frequency=1, start=0, end=maxsize,
-                 filemode: str = 'a', write_count: int = 0, clear_records_on_write: bool = True):
-        super().__init__(id, model, priority, frequency, start, end)
+                 filemode: str = 'a', write_count: int = 0, clear_records_on_write: bool = True, dtype=None):
+        super().__init__(id, model, priority, frequency, start, end, dtype)
 
         self.filename = filename
         self.filemode = filemode
@@ -122,11 +263,11 @@ class FileCollector(Collector):
                 self.records.clear()
 
     def write_records(self):
-        """Loops through all of the self.records and writes their contents to a file specified by the self.filename
-        property."""
-        file = open(self.filename, self.filemode)
-
-        for record in self.records:
-            file.write(record)
-
-        file.close()
+        """Writes the contents of all of the self.records to a file specified by the self.filename property. The
+        records are handed to the file in a single writelines() call rather than one write() call per record."""
+        with open(self.filename, self.filemode) as file:
+            if isinstance(self.records, RecordBuffer):
+                # A single write of the buffer's contents
+                self.records.array.tofile(file)
+            else:
+                file.writelines(self.records)
@@ -1,12 +1,15 @@
+import bisect
 import logging
 import random
 
+import numpy as np
+
 import ECAgent.Tags as Tags
 
 from enum import IntEnum
-from sys import maxsize
+from sys import intern, maxsize
 from deprecated import deprecated
-from typing import Union
+from typing import Callable, Iterable, Union
 
 
 class ModelStatus(IntEnum):
@@ -33,11 +36,14 @@ class Model:
         The ``SystemManager`` assigned to the model.
     random : random.Random
         The model's pseudo-random number generator.
+    rng : numpy.random.Generator
+        A NumPy pseudo-random number generator seeded with the same seed as ``random``. Use it for bulk draws (e.g.
+        ``model.rng.integers(0, 10, size=1000)``). It is created the first time it is accessed.
     logger : logging.Logger
         The model's logger.
     """
 
-    __slots__ = ['environment', 'systems', 'random', 'logger', '_status']
+    __slots__ = ['environment', 'systems', 'random', 'logger', '_status', '_seed', '_rng']
 
     def __init__(self, seed: int = None, logger: logging.Logger = None):
 
@@ -49,11 +55,16 @@ class Model:
         # is added.
 
         self.random = random.Random(seed)
+        # The NumPy generator is comparatively expensive to create so it is only created if it is used. See Model.rng
+        self._seed = seed
+        self._rng = None
 
         # Add logger if custom logger isn't specified
         if logger is None:
             self.logger = logging.getLogger('MODEL')
-            self.logger.setLevel(logging.INFO)
+            # setLevel() clears the logging module's caches, which makes it a large part of Model() construction
+            if self.logger.level != logging.INFO:
+                self.logger.setLevel(logging.INFO)
         else:
             self.logger = logger
 
@@ -80,6 +91,13 @@ class Model:
         else:
             raise AttributeError(f'Attribute {item} is not recognized as an attribute of Model or SystemManager')
 
+    @property
+    def rng(self) -> np.random.Generator:
+        """The model's ``numpy.random.Generator``. Created on first access using the seed the model was given."""
+        if self._rng is None:
+            self._rng = np.random.default_rng(self._seed)
+        return self._rng
+
     def __bool__(self) -> bool:
         """Returns ``True`` if model is still running and ``False`` if model is complete.
 
@@ -146,22 +164,102 @@ class Model:
             raise ValueError("Value of 'n' must be greater than or equal 1.")
 
 
+# Recycled Component instances. The key is the type of the Component. See Component.acquire() and Component.release()
+_component_pools = {}
+
+# Recycled Agent instances. The key is the type of the Agent. See Agent.acquire() and Agent.release()
+_agent_pools = {}
+
+# Bumped whenever an agent gains or loses a component or an environment gains or loses an agent. Environments use it
+# to tell whether the results of previous get_agents() queries are still valid. See Environment.get_agents()
+_structure_version = 0
+
+
 class Component:
     """This is the base class for Components. Inherit from this class to make your own components.
 
+    ECAgent's base classes (``Component``, ``Agent``, ``System``, etc.) define ``__slots__`` to reduce their memory
+    footprint and speed up attribute access. Subclasses that don't declare ``__slots__`` of their own will still get a
+    ``__dict__`` and work as expected. Declare ``__slots__`` on your subclass if you want the same benefits::
+
+        class MoneyComponent(Component):
+            __slots__ = ['wealth']
+
+            def __init__(self, agent, model):
+                super().__init__(agent, model)
+                self.wealth = 0
+
     Attributes
     ----------
     agent : Agent
         The agent the component belongs to.
     model : Model
         The model the component's agent belongs to.
+    max_pool_size : int
+        Class attribute that sets the maximum number of released components of a given type that will be kept for reuse
+        by ``Component.acquire()``. Defaults to ``1024``.
     """
     __slots__ = ['agent', 'model']
 
+    max_pool_size = 1024
+
     def __init__(self, agent, model: Model):
         self.agent = agent
         self.model = model
 
+    @classmethod
+    def acquire(cls, agent, model: Model, *args, **kwargs):
+        """Returns a component of type ``cls``, reusing a previously released component if one is available.
+
+        The recycled component is re-initialized by calling its ``__init__`` method with the supplied arguments. This is
+        useful in models where agents are frequently created and removed::
+
+            agent.add_component(MoneyComponent.acquire(agent, model))
+            ...
+            agent.remove_component(MoneyComponent, release=True)
+
+        Parameters
+        ----------
+        agent : Agent
+            The agent the component belongs to.
+        model : Model
+            The model the component's agent belongs to.
+        *args
+            Additional positional arguments supplied to the component's ``__init__`` method.
+        **kwargs
+            Additional keyword arguments supplied to the component's ``__init__`` method.
+
+        Returns
+        -------
+        Component
+            A component of type ``cls``.
+        """
+        pool = _component_pools.get(cls)
+        if pool:
+            component = pool.pop()
+            component.__init__(agent, model, *args, **kwargs)
+            return component
+        return cls(agent, model, *args, **kwargs)
+
+    def release(self):
+        """Returns the component to its type's pool so that it can be reused by ``Component.acquire()``.
+
+        The component's ``agent`` and ``model`` are cleared. The component is discarded if the pool already contains
+        ``max_pool_size`` components. A released component should not be used again until it has been re-acquired.
+        """
+        # Cleared even if the component is discarded so that the agent <-> component reference cycle is broken and
+        # both can be freed by reference counting rather than the garbage collector
+        self.agent = None
+        self.model = None
+        pool = _component_pools.setdefault(type(self), [])
+        if len(pool) < self.max_pool_size:
+            pool.append(self)
+
+    @classmethod
+    def clear_pool(cls):
+        """Discards all released components of type ``cls``."""
+        _component_pools.pop(cls, None)
+
 
 class _MetaAgent(type):
     """This is the base metaclass for ``Agent`` classes. The class is responsible for supporting class components (
@@ -255,7 +353,7 @@ class _MetaAgent(type):
         ValueError
             If the agent already has a component of that type.
         """
-        if type(component) in self.components.keys():
+        if type(component) in self._components:
             raise ValueError(f"Agent {self.id} already has a component of type {type(component)}.")
         else:
             self._components[type(component)] = component
@@ -272,10 +370,8 @@ class _MetaAgent(type):
         ComponentNotFoundError
             If agent does not have a component of class ``component_type``.
         """
-        if component_type not in self.components.keys():
+        if self._components.pop(component_type, None) is None:
             raise ComponentNotFoundError(self, component_type)
-        else:
-            del self._components[component_type]
 
     def get_class_component(self, component_type: type, throw_error: bool = False):
         """Gets a component that is the same type as ``component_type``.
@@ -299,12 +395,10 @@ class _MetaAgent(type):
         ComponentNotFoundError
             If ``throw_error`` is ``True`` and no component matching ``component_type`` is found.
         """
-        if component_type in self.components.keys():
-            return self._components[component_type]
-        elif throw_error:
+        component = self._components.get(component_type)
+        if component is None and throw_error:
             raise ComponentNotFoundError(self, component_type)
-        else:
-            return None
+        return component
 
     def has_class_component(self, *args) -> bool:
         """Returns a (True/False) bool if the agent class (does/does not) have the list of specified components.
@@ -327,8 +421,9 @@ class _MetaAgent(type):
         bool
             ``True`` if ``Agent`` has all of the components listed, else ``False``
         """
+        components = self._components
         for component in args:
-            if component not in self._components.keys():
+            if component not in components:
                 return False
         return True
 
@@ -349,19 +444,80 @@ class Agent(object, metaclass=_MetaAgent):
     tag : int
         The value of the Tag associated with the ``Agent``. Defaults to 0 (which is the value ``NONE``) or the
         default tag value of the Agent's metaclass.
+    max_pool_size : int
+        Class attribute that sets the maximum number of released agents of a given type that will be kept for reuse by
+        ``Agent.acquire()``. Defaults to ``1024``.
     """
 
     __slots__ = ['id', 'model', 'components', 'tag']
 
+    max_pool_size = 1024
+
     def __init__(self, id: str, model: Model, tag: int = None):
-        self.id = id
+        # Interned ids make agent dict lookups cheaper. sys.intern() rejects str subclasses, hence the exact type check
+        self.id = intern(id) if type(id) is str else id
         self.model = model
         self.components = {}
         self.tag = Agent.tag if tag is None else tag
 
+    @classmethod
+    def acquire(cls, id: str, model: Model, *args, **kwargs):
+        """Returns an agent of type ``cls``, reusing a previously released agent if one is available.
+
+        The recycled agent is re-initialized by calling its ``__init__`` method with the supplied arguments. This is
+        useful in models where agents are frequently created and removed (or where a model is rebuilt many times)::
+
+            environment.add_agent(Sheep.acquire('s1', model))
+            ...
+            environment.remove_agent('s1', release=True)
+
+        Parameters
+        ----------
+        id : str
+            The agent's unique identifier.
+        model : Model
+            The ``Model`` the ``Agent`` belongs to.
+        *args
+            Additional positional arguments supplied to the agent's ``__init__`` method.
+        **kwargs
+            Additional keyword arguments supplied to the agent's ``__init__`` method.
+
+        Returns
+        -------
+        Agent
+            An agent of type ``cls``.
+        """
+        pool = _agent_pools.get(cls)
+        if pool:
+            agent = pool.pop()
+            agent.__init__(id, model, *args, **kwargs)
+            return agent
+        return cls(id, model, *args, **kwargs)
+
+    def release(self):
+        """Releases all of the agent's components using ``Component.release()`` and returns the agent to its type's
+        pool so that it can be reused by ``Agent.acquire()``.
+
+        The agent's ``model`` is cleared. The agent is discarded if the pool already contains ``max_pool_size`` agents.
+        A released agent should not be used again until it has been re-acquired. Use ``Environment.remove_agent(a_id,
+        release=True)`` to release agents that belong to an environment.
+        """
+        for component in self.components.values():
+            component.release()
+        self.components.clear()
+        self.model = None
+        pool = _agent_pools.setdefault(type(self), [])
+        if len(pool) < self.max_pool_size:
+            pool.append(self)
+
+    @classmethod
+    def clear_pool(cls):
+        """Discards all released agents of type ``cls``."""
+        _agent_pools.pop(cls, None)
+
     def __getitem__(self, item: type):
         """Wrapper for the ``Agent.get_component()`` function."""
-        return self.get_component(item)
+        return self.components.get(item)  # Inlined as agent[...] is the most common way components are accessed
 
     def __len__(self) -> int:
         """Returns the number of components attached to a given agent."""
@@ -369,7 +525,7 @@ class Agent(object, metaclass=_MetaAgent):
 
     def __contains__(self, item: type):
         """Wrapper method for ``Agent.has_component(item)``."""
-        return self.has_component(item)
+        return item in self.components
 
     def add_component(self, component: Component):
         """Adds a ``Component`` to the ``Agent``.
@@ -384,32 +540,46 @@ class Agent(object, metaclass=_MetaAgent):
         ValueError
             If the agent already has a component of that type.
         """
-        if type(component) in self.components.keys():
-            raise ValueError(f"Agent {self.id} already has a component of type {type(component)}.")
+        global _structure_version
+        component_type = type(component)
+        if component_type in self.components:
+            raise ValueError(f"Agent {self.id} already has a component of type {component_type}.")
         else:
-            self.components[type(component)] = component
+            self.components[component_type] = component
+            _structure_version += 1
 
     @deprecated(reason='For not meeting standard python naming conventions. Use "add_component" instead.')
     def addComponent(self, component: Component):  # pragma no cover
         """Deprecated. Use ``add_component`` instead."""
         self.add_component(component)
 
-    def remove_component(self, component_type: type):
+    def remove_component(self, component_type: type, release: bool = False):
         """Removes component of type ```component_type`` from the agent.
 
         Parameters:
         component_type : type
             Class of component to be removed from agent.
+        release : bool, Optional
+            If ``True``, the removed component is deregistered from the model's ``SystemManager`` (if it is registered)
+            and returned to its pool using ``Component.release()`` so that it may be reused by ``Component.acquire()``.
+            Defaults to ``False``.
 
         Raises
         ------
         ComponentNotFoundError
             If agent does not have a component of class ``component_type``.
         """
-        if component_type not in self.components.keys():
+        global _structure_version
+        component = self.components.pop(component_type, None)
+        if component is None:
             raise ComponentNotFoundError(self, component_type)
-        else:
-            del self.components[component_type]
+        _structure_version += 1
+        if release:
+            # The pooled component may be handed to another agent by acquire(), so it can't stay registered
+            index = self.model.systems._pool_index.get(component_type)
+            if index is not None and id(component) in index:
+                self.model.systems.deregister_component(component)
+            component.release()
 
     @deprecated(reason='For not meeting standard python naming conventions. Use "remove_component" instead.')
     def removeComponent(self, component_type: type):  # pragma: no cover
@@ -437,12 +607,10 @@ class Agent(object, metaclass=_MetaAgent):
         ComponentNotFoundError
             If ``throw_error`` is ``True`` and no component matching ``component_type`` is found.
         """
-        if component_type in self.components.keys():
-            return self.components[component_type]
-        elif throw_error:
+        component = self.components.get(component_type)
+        if component is None and throw_error:
             raise ComponentNotFoundError(self, component_type)
-        else:
-            return None
+        return component
 
     @deprecated(reason='For not meeting standard python naming conventions. Use "get_component" instead.')
     def getComponent(self, component_type: type, throw_error: bool = False):  # pragma: no cover
@@ -470,8 +638,9 @@ class Agent(object, metaclass=_MetaAgent):
         bool
             ``True`` if ``Agent`` has all of the components listed, else ``False``
         """
+        components = self.components
         for component in args:
-            if component not in self.components.keys():
+            if component not in components:
                 return False
         return True
 
@@ -498,30 +667,125 @@ class System:
         The timestep at which the system should start executing. Defaults to ``0``.
     end : int
         The last timestep at which the system should start executing. Defaults to ``sys.maxsize``.
+    kernel : Callable
+        A class-level function that, if set, is called once per ``execute()`` with the arrays returned by
+        ``kernel_args()`` instead of requiring ``execute()`` to be overridden. Defaults to ``None``.
     """
 
-    __slots__ = ['id', 'model', 'priority', 'frequency', 'start', 'end']
+    __slots__ = ['id', 'model', 'priority', '_frequency', '_start', '_end']
+
+    kernel = None
 
     def __init__(self, id: str, model: Model, priority: int = 0,
                  frequency: int = 1, start: int = 0, end: int = maxsize):
-        self.id = id
+        # Interned ids make system dict lookups cheaper. sys.intern() rejects str subclasses, hence the exact type check
+        self.id = intern(id) if type(id) is str else id
         self.model = model
         self.priority = priority
         self.frequency = frequency
         self.start = start
         self.end = end
 
+    def _reschedule(self):
+        """Rebuilds the schedule of the ``SystemManager`` the system has been added to (if any)."""
+        systems = self.model.systems if self.model is not None else None
+        if systems is not None and systems.systems.get(self.id) is self:
+            systems._build_schedule()
+
+    @property
+    def frequency(self) -> int:
+        return self._frequency
+
+    @frequency.setter
+    def frequency(self, value: int):
+        self._frequency = value
+        self._reschedule()
+
+    @property
+    def start(self) -> int:
+        return self._start
+
+    @start.setter
+    def start(self, value: int):
+        self._start = value
+        self._reschedule()
+
+    @property
+    def end(self) -> int:
+        return self._end
+
+    @end.setter
+    def end(self, value: int):
+        self._end = value
+        self._reschedule()
+
     def clean_up(self):
         self.model.systems.remove_system(self.id)
 
     def execute(self):
         """Abstract method which, when overridden by a child class, defines the the system's logic.
 
+        If the system has a ``kernel``, it is called with the arrays returned by ``kernel_args()`` so that all entities
+        are updated by a single call.
+
         Raises
         ------
         NotImplementedError
+            If the method is not overridden and the system has no ``kernel``.
         """
-        raise NotImplementedError
+        if self.kernel is None:
+            raise NotImplementedError
+        self.kernel(*self.kernel_args())
+
+    def kernel_args(self) -> tuple:
+        """Returns the arguments (typically NumPy arrays holding component data) that ``kernel`` is called with.
+
+        Override this method alongside ``kernel``. Returns an empty tuple by default.
+        """
+        return ()
+
+    @staticmethod
+    def njit_kernel(func: Callable = None, **njit_options):
+        """Compiles ``func`` with Numba so that it can be used as a system's ``kernel``. Numba is an optional
+        dependency and is only imported when this method is called.
+
+        By default, ``func`` is compiled with ``numba.njit(cache=True)``. Other Numba options, such as ``parallel`` or
+        ``fastmath``, can be supplied as keyword arguments. Note that ``fastmath=True`` allows Numba to reorder floating
+        point operations and to assume that no values are NaN or infinite, which can change the kernel's results.
+
+        Example
+        -------
+        ::
+
+            class MoveSystem(System):
+
+                @System.njit_kernel(parallel=True)
+                def kernel(positions, velocities):
+                    for i in numba.prange(len(positions)):
+                        positions[i] += velocities[i]
+
+                def kernel_args(self):
+                    return self.model.positions, self.model.velocities
+
+        Parameters
+        ----------
+        func : Callable, Optional
+            The function to compile. If omitted, a decorator that compiles the function it is applied to with
+            ``njit_options`` is returned instead.
+        **njit_options
+            Keyword arguments supplied to ``numba.njit``. ``cache`` defaults to ``True``.
+
+        Returns
+        -------
+        staticmethod
+            The compiled function, wrapped so that it is not bound to the system when accessed as ``self.kernel``.
+        """
+        if func is None:
+            return lambda f: System.njit_kernel(f, **njit_options)
+
+        from numba import njit
+        njit_options.setdefault('cache', True)
+        return staticmethod(njit(**njit_options)(func))
 
 
 class SystemManager:
@@ -541,17 +805,31 @@ class SystemManager:
         A list of containing the order at which the systems execute when ``execute_systems()`` is called.
     component_pools : dict
         A dictionary containing lists of all components registered with the ``SystemManager``. The key is type of the
-        ``Component``.
+        ``Component``. Deregistering a component moves the last component of its pool into the vacated slot, so pools
+        are not guaranteed to stay in registration order.
     """
 
-    __slots__ = ['timestep', 'systems', 'execution_queue', 'component_pools', 'model']
+    __slots__ = ['timestep', 'systems', 'execution_queue', 'component_pools', 'model', '_pool_index', '_priorities',
+                 '_schedule', '_derived_types', '_every_step']
 
     def __init__(self, model: Model):
         self.timestep = 0
         self.systems = {}
         self.execution_queue = []
+        # Negated priorities of the systems in execution_queue (same order) used to bisect insertion points.
+        self._priorities = []
+        # Frozen (start, end, frequency, execute) records for each system in execution_queue. See _build_schedule().
+        self._schedule = ()
+        # The bound execute methods of the systems in execution_queue if every system executes every timestep (which is
+        # the default schedule), else None. See _build_schedule().
+        self._every_step = ()
         self.component_pools = {}
         self.model = model
+        # Maps id(component) to the component's position in its component_pools list so that (de)registration
+        # neither scans nor shifts the pool.
+        self._pool_index = {}
+        # Maps a component type to the registered types that subclass it. Used by get_components(include_subclasses=True)
+        self._derived_types = {}
 
     def __getitem__(self, item: Union[str, type]) -> Union[System, list, None]:
         """Gets ``System`` with ``id == item`` or ``list`` of components whose ``type == item``.
@@ -619,18 +897,16 @@ class SystemManager:
         KeyError
             If system already exists in the execution queue.
         """
-        if s.id in self.systems.keys():
+        if s.id in self.systems:
             raise KeyError(f"System {s.id} already registered with the execution queue.")
         else:
             self.systems[s.id] = s  # Add to systems dict
-            # Add to event queue
-            for i in range(0, len(self.execution_queue)):
-                if s.priority > self.execution_queue[i].priority:
-                    self.execution_queue.insert(i, s)
-                    break
-            # Add to the end of queue if s has the lowest priority
-            if s not in self.execution_queue:
-                self.execution_queue.append(s)
+            # Add to event queue after all systems with an equal or higher priority
+            key = -s.priority
+            index = bisect.bisect_right(self._priorities, key)
+            self._priorities.insert(index, key)
+            self.execution_queue.insert(index, s)
+            self._build_schedule()
 
     @deprecated(reason='For not meeting standard python naming conventions. Use "add_system" instead.')
     def addSystem(self, s: System):  # pragma: no cover
@@ -650,17 +926,35 @@ class SystemManager:
         SystemNotFoundError
             If the no System with ``System.id == s_id`` can be found.
         """
-        if s_id not in self.systems.keys():
+        if s_id not in self.systems:
             raise SystemNotFoundError(s_id)
         else:
-            self.execution_queue.remove(self.systems[s_id])
+            index = self.execution_queue.index(self.systems[s_id])
+            del self.execution_queue[index]
+            del self._priorities[index]
             del self.systems[s_id]
+            self._build_schedule()
 
     @deprecated(reason='For not meeting standard python naming conventions. Use "remove_system" instead.')
     def removeSystem(self, s_id: str):  # pragma: no cover
         """Deprecated. Use ``remove_system`` instead."""
         self.remove_system(s_id)
 
+    def _build_schedule(self):
+        """Rebuilds the records ``execute_systems()`` uses to decide which systems to execute each timestep.
+
+        The ``start``, ``end``, ``frequency`` and bound ``execute`` method of each system are copied into the records so
+        that the execution loop doesn't have to look them up every timestep. Systems call this method whenever their
+        ``start``, ``end`` or ``frequency`` is changed so that the records never go stale.
+        """
+        self._schedule = tuple((s.start, s.end, s.frequency, s.execute) for s in self.execution_queue)
+
+        # When no system has a custom schedule, execute_systems() can skip the start/end/frequency checks entirely
+        if all(start == 0 and end == maxsize and frequency == 1 for start, end, frequency, _ in self._schedule):
+            self._every_step = tuple(record[3] for record in self._schedule)
+        else:
+            self._every_step = None
+
     def execute_systems(self, throw_error: bool = False):
         """Function that loops through all systems in the ``execution_queue`` and calls the ``execute()`` method.
         The value of ``SystemManager.timestep`` is increased by ``1`` each time this method is called.
@@ -671,7 +965,7 @@ class SystemManager:
         The function uses the System's ``start``, ``end`` and ``frequency`` to determine if its ``execute()`` should be
         called::
 
-        if sys.start <= self.timestep <= sys.end and (sys.start - self.timestep) % sys.frequency == 0:
+            if sys.start <= self.timestep <= sys.end and (self.timestep - sys.start) % sys.frequency == 0:
                 sys.execute()
 
         Parameters
@@ -693,11 +987,19 @@ class SystemManager:
             else:
                 return
 
-        for sys in self.execution_queue:  # Simple execute cycle
-            if not self.model.is_running():
-                break
-            if sys.start <= self.timestep <= sys.end and (sys.start - self.timestep) % sys.frequency == 0:
-                sys.execute()
+        t = self.timestep
+        is_running = self.model.is_running
+        if self._every_step is not None and t >= 0:
+            for execute in self._every_step:
+                if not is_running():
+                    break
+                execute()
+        else:
+            for start, end, frequency, execute in self._schedule:  # Simple execute cycle
+                if not is_running():
+                    break
+                if start <= t <= end and (t - start) % frequency == 0:
+                    execute()
         self.timestep += 1
 
     @deprecated(reason='For not meeting standard python naming conventions. Use "execute_systems" instead.')
@@ -719,13 +1021,22 @@ class SystemManager:
         KeyError
             When ``component`` has already been registered with the ``SystemManager``.
         """
-        if type(component) not in self.component_pools.keys():
-            self.component_pools[type(component)] = [component]
-        elif component in self.component_pools[type(component)]:
-            raise KeyError(f"Agent {component.agent.id}'s {str(type(component))} Component already registered with the"
+        component_type = type(component)
+        # A pool and its index are always created and deleted together, so one lookup covers both
+        index = self._pool_index.get(component_type)
+        if index is None:
+            self.component_pools[component_type] = [component]
+            self._pool_index[component_type] = {id(component): 0}
+            # Walk the MRO once per pool rather than on every subclass query
+            for base in component_type.__mro__[1:]:
+                self._derived_types.setdefault(base, {})[component_type] = None
+        elif id(component) in index:
+            raise KeyError(f"Agent {component.agent.id}'s {str(component_type)} Component already registered with the"
                            f"System Manager.")
         else:
-            self.component_pools[type(component)].append(component)
+            pool = self.component_pools[component_type]
+            index[id(component)] = len(pool)
+            pool.append(component)
 
     def deregister_component(self, component: Component):
         """Deregisters (removes) a component from the ``SystemManager`` component pool.
@@ -740,17 +1051,26 @@ class SystemManager:
         KeyError
             When ``component`` is not registered with the ``SystemManager``.
         """
-        if type(component) not in self.component_pools.keys():
-            raise KeyError(f"No components with type {str(type(component))} registered with the SystemManager.")
-        elif component not in self.component_pools[type(component)]:
-            raise KeyError(f"Cannot deregister Agent {component.agent.id}'s {str(type(component))} Component because "
+        component_type = type(component)
+        index = self._pool_index.get(component_type)
+        if index is None:
+            raise KeyError(f"No components with type {str(component_type)} registered with the SystemManager.")
+        i = index.pop(id(component), None)
+        if i is None:
+            raise KeyError(f"Cannot deregister Agent {component.agent.id}'s {str(component_type)} Component because "
                            f"it was never registered with the SystemManager to begin with.")
         else:
-            self.component_pools[type(component)].remove(component)
-            if len(self.component_pools[type(component)]) == 0:
-                del self.component_pools[type(component)]
-
-    def get_components(self, component_type: type, throw_error: bool = False):
+            pool = self.component_pools[component_type]
+            # Swap-and-pop: fill the vacated slot with the last component instead of shifting the whole pool
+            last = pool.pop()
+            if last is not component:
+                pool[i] = last
+                index[id(last)] = i
+            if not pool:
+                del self.component_pools[component_type]
+                del self._pool_index[component_type]
+
+    def get_components(self, component_type: type, throw_error: bool = False, include_subclasses: bool = False):
         """Returns the list of components registered to the ``SystemManager`` with a type of ``component_type``.
         Returns ``None`` if there are no components of type ``component_type`` registered with the ``SystemManager``.
 
@@ -761,6 +1081,10 @@ class SystemManager:
         throw_error : bool, Optional
             Determines if the function should raise a ``KeyError`` when it cannot find components of
             ``type == component_type``. Defaults to ``False``
+        include_subclasses : bool, Optional
+            If ``True``, components whose type is a subclass of ``component_type`` are returned as well (after the
+            components of type ``component_type``). The result is then a new list rather than the component pool
+            itself. Defaults to ``False``.
 
         Returns
         -------
@@ -774,9 +1098,16 @@ class SystemManager:
         KeyError
             If ``throw_error = True`` and no components of ``type == component_type`` are found.
         """
-        if component_type in self.component_pools.keys():
+        if include_subclasses:
+            pools = self.component_pools
+            matching = [component for t in (component_type, *self._derived_types.get(component_type, ())) if t in pools
+                        for component in pools[t]]
+            if matching:
+                return matching
+        elif component_type in self.component_pools:
             return self.component_pools[component_type]
-        elif throw_error:
+
+        if throw_error:
             raise KeyError(f'No Components of type {component_type} could be found.')
         else:
             return None
@@ -807,11 +1138,13 @@ class Environment(Agent):
         The value of the Tag associated with the environment. Defaults to 0 (which is the value ``NONE``).
     """
 
-    __slots__ = ['agents']
+    __slots__ = ['agents', '_query_cache']
 
     def __init__(self, model, id: str = 'ENVIRONMENT'):
         super().__init__(id, model)
         self.agents = {}
+        # Component template -> (_structure_version, matching agents). See get_agents()
+        self._query_cache = {}
 
     def set_model(self, model: Model):
         self.model = model
@@ -830,37 +1163,81 @@ class Environment(Agent):
         DuplicateAgentError
             If the agent already exists in the environment.
         """
-        if agent.id in self.agents.keys():
+        global _structure_version
+        if agent.id in self.agents:
             raise DuplicateAgentError(agent.id, self.model.environment)
         else:
+            _structure_version += 1
+            self._query_cache.clear()  # Every cached result is stale now, so don't keep its agents alive
             self.agents[agent.id] = agent
-            for ckey in agent.components:
-                self.model.systems.register_component(agent[ckey])
+            for component in agent.components.values():
+                self.model.systems.register_component(component)
+
+    def add_agents(self, agents: Iterable[Agent]):
+        """Adds several agents to the environment at once. This is faster than calling ``Environment.add_agent()`` for
+        each agent when creating large populations.
+
+        Either all of the agents are added or, if any of them is a duplicate, none of them are.
+
+        Parameters
+        ----------
+        agents : Iterable[Agent]
+            The agents being added to the environment.
+
+        Raises
+        ------
+        DuplicateAgentError
+            If an agent already exists in the environment or appears more than once in ``agents``.
+        """
+        global _structure_version
+        existing_agents = self.agents
+        new_agents = {}
+        for agent in agents:
+            if agent.id in existing_agents or agent.id in new_agents:
+                raise DuplicateAgentError(agent.id, self)
+            new_agents[agent.id] = agent
+
+        _structure_version += 1
+        self._query_cache.clear()
+        existing_agents.update(new_agents)
+        for agent in new_agents.values():
+            for component in agent.components.values():
+                self.model.systems.register_component(component)
 
     @deprecated(reason='For not meeting standard python naming conventions. Use "add_agent" instead.')
     def addAgent(self, agent: Agent):  # pragma: no cover
         """Deprecated. Use ``Environment.add_agent`` instead."""
         self.add_agent(agent)
 
-    def remove_agent(self, a_id: str):
+    def remove_agent(self, a_id: str, release: bool = False):
         """Removes an agent with ``agent.id == a_id`` from the environment.
 
         Parameters
         ----------
         a_id : str
             The ``id`` of the agent to remove.
+        release : bool, Optional
+            If ``True``, the agent and its components are returned to their pools using ``Agent.release()``. This also
+            breaks the reference cycles between the agent and its components so that both are freed immediately
+            instead of by the garbage collector if they are not reused. Defaults to ``False``.
 
         Raises
         ------
         AgentNotFoundError
             If no agent with an ``agent.id == a_id`` can be found.
         """
-        if a_id not in self.agents.keys():
+        global _structure_version
+        agent = self.agents.get(a_id)
+        if agent is None:
             raise AgentNotFoundError(a_id, self)
         else:
-            for ckey in self.agents[a_id].components:
-                self.model.systems.deregister_component(self.agents[a_id][ckey])
+            _structure_version += 1
+            self._query_cache.clear()  # Cached results may reference the agent
+            for component in agent.components.values():
+                self.model.systems.deregister_component(component)
             del self.agents[a_id]
+            if release:
+                agent.release()
 
     @deprecated(reason='For not meeting standard python naming conventions. Use "remove_agent" instead.')
     def removeAgent(self, a_id: str):  # pragma: no cover
@@ -890,17 +1267,15 @@ class Environment(Agent):
         AgentNotFoundError
             If ``throw_error == True`` and agent with ``agent.id == id`` could not be found.
         """
-        if id in self.agents.keys():
-            return self.agents[id]
-        elif throw_error:
+        agent = self.agents.get(id)
+        if agent is None and throw_error:
             raise AgentNotFoundError(id, self)
-        else:
-            return None
+        return agent
 
-    @deprecated(reason='For not meeting standard python naming conventions. Use "remove_agent" instead.')
+    @deprecated(reason='For not meeting standard python naming conventions. Use "get_agent" instead.')
     def getAgent(self, id: str, throw_error: bool = False):  # pragma: no cover
-        """Deprecated. Use ``Environment.remove_agent`` instead."""
-        self.get_agent(id, throw_error)
+        """Deprecated. Use ``Environment.get_agent`` instead."""
+        return self.get_agent(id, throw_error)
 
     @deprecated(reason='For not meeting standard python naming conventions. Use "get_random_agent" instead')
     def getRandomAgent(self, *args):  # pragma: no cover
@@ -927,13 +1302,53 @@ class Environment(Agent):
         None
             If no agents exist that match the Component template or tag specified.
         """
-        valid_agents = self.get_agents(*args, tag=tag)
+        # Sample straight from the cached agent list unless it still needs to be filtered by tag
+        valid_agents = self._matching_agents(args) if tag is None else self.get_agents(*args, tag=tag)
         # Return none if no agent matches filter
         if len(valid_agents) == 0:
             return None
 
         return self.model.random.choice(valid_agents)
 
+    def get_random_agents(self, n: int, *args, tag: int = None, replace: bool = True) -> list:
+        """Returns a list of ``n`` random agents in the environment.
+
+        Works like ``Environment.get_random_agent`` but draws all ``n`` agents with a single call to ``model.rng``
+        rather than ``n`` calls to ``model.random``.
+
+        Parameters
+        ----------
+        n : int
+            The number of agents to select.
+        *args : Optional
+            A template (list of Components) the returned agents must have.
+        tag : int, Optional
+            Tag that the returned agents must have.
+        replace : bool, Optional
+            Whether the same agent may be selected more than once. Defaults to ``True``.
+
+        Returns
+        -------
+        list
+            Of randomly selected agents matching the Component template or tag specified. The list is empty if no
+            agents match.
+
+        Raises
+        ------
+        ValueError
+            If ``replace == False`` and fewer than ``n`` agents match the Component template or tag specified.
+        """
+        valid_agents = self._matching_agents(args) if tag is None else self.get_agents(*args, tag=tag)
+        if len(valid_agents) == 0:
+            return []
+
+        if replace:
+            indices = self.model.rng.integers(0, len(valid_agents), size=n)
+        else:
+            indices = self.model.rng.choice(len(valid_agents), size=n, replace=False)
+
+        return [valid_agents[i] for i in indices.tolist()]
+
     @deprecated(reason='For not meeting standard python naming conventions. Use "get_agent" instead')
     def getAgents(self, *args):  # pragma: no cover
         """Deprecated. Use ``Environment.get_agents`` instead."""
@@ -968,6 +1383,10 @@ class Environment(Agent):
             # This will return a list of agents with Components of type 'Component1' and tag == PREY
             template_tag_search = environments.get_agents(Component1, tag = Tags.PREY)
 
+        Results are cached until an agent gains or loses a component or the environment
+        gains or loses an agent, so components must be added and removed using ``Agent.add_component()`` and
+        ``Agent.remove_component()`` rather than by editing ``agent.components`` directly.
+
         Parameters
         ----------
         *args : Optional
@@ -979,21 +1398,32 @@ class Environment(Agent):
         list
             list of Agents
         """
-        matching_agents = []
+        matching_agents = self._matching_agents(args)
+
+        # Filter by tag if tag was supplied
+        if tag is not None:
+            return [a for a in matching_agents if a.tag == tag]
+
+        # Copy so that callers (e.g. shuffle()) can't modify the cached list
+        return matching_agents.copy()
+
+    def _matching_agents(self, args: tuple) -> list:
+        """Returns the (cached) list of agents with all of the components in ``args``. The list must not be modified.
+
+        The list is reused until an agent gains or loses a component or the environment gains or loses an agent.
+        """
+        cached = self._query_cache.get(args)
+        if cached is not None and cached[0] == _structure_version:
+            return cached[1]
 
         # If no component filter is supplied, return all agents
-        if len(args) == 0:
-            matching_agents = [self.agents[agentKey] for agentKey in self.agents]
+        if not args:
+            matching_agents = list(self.agents.values())
         else:
             # If a component filter is supplied, filter for agents that meet the condition
-            for agentKey in self.agents:
-                if self.agents[agentKey].has_component(*args):
-                    matching_agents.append(self.agents[agentKey])
-
-        # Filter by tag if tag was supplied
-        if tag is not None:
-            matching_agents = [a for a in matching_agents if a.tag == tag]
+            matching_agents = [agent for agent in self.agents.values() if agent.has_component(*args)]
 
+        self._query_cache[args] = (_structure_version, matching_agents)
         return matching_agents
 
     def __len__(self):
@@ -1001,8 +1431,8 @@ class Environment(Agent):
         return len(self.agents)
 
     def __iter__(self):
-        """Returns a tuple of all agents in the environment."""
-        return (self.agents[a] for a in self.agents)
+        """Returns an iterator over all agents in the environment."""
+        return iter(self.agents.values())
 
     def shuffle(self, *args, tag: int = None):
         """Returns a list of agents with matching components in a random order.
@@ -1060,8 +1490,15 @@ class AgentNotFoundError(Exception):
         """
         self.a_id = a_id
         self.environment = environment
-        self.message = f'Agent "{a_id}" could not be found in Environment "{environment.id}"'
-        super(AgentNotFoundError, self).__init__(self.message)
+        super(AgentNotFoundError, self).__init__(a_id, environment)
+
+    def __str__(self):
+        return self.message
+
+    @property
+    def message(self) -> str:
+        # Formatted on demand so callers that catch the error never pay for the f-string
+        return f'Agent "{self.a_id}" could not be found in Environment "{self.environment.id}"'
 
 
 class DuplicateAgentError(Exception):
@@ -1087,8 +1524,14 @@ class DuplicateAgentError(Exception):
         """
         self.a_id = a_id
         self.environment = environment
-        self.message = f'Agent "{a_id}" already exists in Environment "{environment.id}"'
-        super(DuplicateAgentError, self).__init__(self.message)
+        super(DuplicateAgentError, self).__init__(a_id, environment)
+
+    def __str__(self):
+        return self.message
+
+    @property
+    def message(self) -> str:
+        return f'Agent "{self.a_id}" already exists in Environment "{self.environment.id}"'
 
 
 class ComponentNotFoundError(Exception):
@@ -1115,8 +1558,14 @@ class ComponentNotFoundError(Exception):
         """
         self.agent = agent
         self.component_type = component_type
-        self.message = f'Agent {agent.id} does not have a component of type {str(component_type)}.'
-        super(ComponentNotFoundError, self).__init__(self.message)
+        super(ComponentNotFoundError, self).__init__(agent, component_type)
+
+    def __str__(self):
+        return self.message
+
+    @property
+    def message(self) -> str:
+        return f'Agent {self.agent.id} does not have a component of type {str(self.component_type)}.'
 
 
 class SystemNotFoundError(Exception):
@@ -1138,8 +1587,14 @@ class SystemNotFoundError(Exception):
         ``id`` of system that was searched for.
         """
         self.s_id = s_id
-        self.message = f'System with id "{s_id}" does not exist.'
-        super(SystemNotFoundError, self).__init__(self.message)
+        super(SystemNotFoundError, self).__init__(s_id)
+
+    def __str__(self):
+        return self.message
+
+    @property
+    def message(self) -> str:
+        return f'System with id "{self.s_id}" does not exist.'
 
 
 class ModelCompleteError(Exception):
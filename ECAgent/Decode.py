@@ -1,4 +1,3 @@
-import json
 import sys
 
 from ECAgent.Core import Model
@@ -8,12 +7,47 @@ class IDecodable:
     """This class serves as the base class for Decode submodel. By inheriting from this class your Components, Systems
      and Agents can be decoded from a text file and built into an executable model
 
-     In order to implement this class, the decode() static function must be overwritten."""
+     In order to implement this class, the decode() static function must be overwritten.
+
+     By default, the decoder calls decode() once per agent and adds each agent to the environment before decoding the
+     next one. Agent types can instead override decode_batch() to create all of their agents at once, in which case
+     the agents are added to the environment after all of them have been created. For example, to draw every agent's
+     random values with a single call to model.rng:
+
+        @classmethod
+        def decode_batch(cls, params: dict, number: int) -> list:
+            model = params['model']
+            wealths = model.rng.integers(0, 10, size=number).tolist()
+            return [cls(f'a{i}', model, wealths[i]) for i in range(number)]"""
 
     @staticmethod
     def decode(params: dict):
         raise NotImplementedError("Call to IDecodable.decode() not allowed.")
 
+    @classmethod
+    def decode_batch(cls, params: dict, number: int) -> list:
+        """Returns a list of ``number`` decoded agents. ``params['agent_index']`` is set to the index of each agent
+        before it is decoded by ``decode(params)``."""
+        return _decode_each(cls.decode, params, number)
+
+
+def _decode_each(decode, params: dict, number: int) -> list:
+    """Calls ``decode(params)`` ``number`` times, setting ``params['agent_index']`` beforehand, and returns the
+    results."""
+    agents = []
+    for i in range(0, number):
+        # Add the index of the agent to the params
+        params['agent_index'] = i
+        agents.append(decode(params))
+    return agents
+
+
+def _intern_keys(d: dict) -> dict:
+    """Returns a copy of ``d`` (and of any nested dictionaries) whose string keys are interned. ``decode()`` reads the
+    same params once per agent, and looking up interned keys with string literals avoids comparing the strings."""
+    return {(sys.intern(k) if type(k) is str else k): (_intern_keys(v) if isinstance(v, dict) else v)
+            for k, v in d.items()}
+
 
 class Decoder:
     """Base decoder class:
@@ -100,7 +134,7 @@ class Decoder:
         # Get decode dictionary
         data = self.open_file(file_path)
 
-        if data is None:
+        if not isinstance(data, dict):
             raise Exception('Unable to open file %s for decoding' % file_path)
 
         # Invoke pre_model_decode
@@ -149,15 +183,21 @@ class Decoder:
             # Add reference to the model in systemDict so that it can be used when creating the agents
             agentDict['params']['model'] = generatedModel
 
-            # Create agents
-            for i in range(0, agentDict['number']):
-                # Add the index of the agent to the agentDict
-                agentDict['params']['agent_index'] = i
-                generatedModel.environment.add_agent(
-                    Decoder.str_to_class(agentDict['name'], Decoder.get_module_name(agentDict)).decode(
-                        agentDict['params']
-                    )
-                )
+            # Create agents. The agent class is resolved once rather than once per agent. Agents are added using
+            # add_agent() so that environments that override it (e.g. SpaceWorld) are used as intended
+            agent_class = Decoder.str_to_class(agentDict['name'], Decoder.get_module_name(agentDict))
+            add_agent = generatedModel.environment.add_agent
+            if isinstance(agent_class, type) and issubclass(agent_class, IDecodable) and \
+                    agent_class.decode_batch.__func__ is not IDecodable.decode_batch.__func__:
+                # The agent type creates all of its agents at once
+                for agent in agent_class.decode_batch(agentDict['params'], agentDict['number']):
+                    add_agent(agent)
+            else:
+                # Each agent is added before the next one is decoded so that decode() can see the agents before it
+                decode = agent_class.decode
+                for i in range(0, agentDict['number']):
+                    agentDict['params']['agent_index'] = i
+                    add_agent(decode(agentDict['params']))
 
             if 'post_agent_init' in agentDict:
                 func = Decoder.str_to_func(agentDict['post_agent_init']['func'],
@@ -175,7 +215,38 @@ class Decoder:
 
 
 class JsonDecoder(Decoder):
+    """Decoder for JSON files. If the optional ``orjson`` package is installed, it is used to parse the file. Files
+    that ``orjson`` rejects but the ``json`` module accepts (e.g. files containing ``NaN``) are still decoded."""
 
     def open_file(self, file_name: str) -> dict:
-        with open(file_name) as json_file:
-            return json.load(json_file)
+        # The JSON parsers are imported here rather than at module level so that importing ECAgent.Decode stays cheap
+        import json
+        try:
+            import orjson  # Optional. Parses JSON files considerably faster than the json module
+        except ImportError:  # pragma: no cover
+            orjson = None
+
+        # Read as bytes since orjson parses bytes directly without decoding them to a str first. The file is read whole,
+        # so it is opened unbuffered to avoid copying it through an intermediate buffer
+        with open(file_name, 'rb', buffering=0) as json_file:
+            content = json_file.read()
+
+        data = None
+        if orjson is not None:
+            try:
+                data = orjson.loads(content)
+            except orjson.JSONDecodeError:
+                pass
+
+        if data is None:
+            data = json.loads(content)
+
+        if not isinstance(data, dict):  # E.g. a file containing a top-level list or null
+            raise Exception('Unable to open file %s for decoding' % file_name)
+
+        # Agent params are read by every call to decode(), so their keys are interned
+        for agentDict in data.get('agents', ()):
+            if 'params' in agentDict:
+                agentDict['params'] = _intern_keys(agentDict['params'])
+
+        return data
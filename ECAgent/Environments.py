@@ -4,7 +4,7 @@ import pandas
 
 from deprecated import deprecated
 from ECAgent.Core import Agent, Environment, Component, Model, ComponentNotFoundError
-from typing import Optional, List
+from typing import Iterable, List, Optional
 
 
 def discrete_grid_pos_to_id(x: int, y: int = 0, width: int = 0, z: int = 0, height: int = 0):
@@ -43,10 +43,14 @@ def discreteGridPosToID(x: int, y: int = 0, width: int = 0, z: int = 0, height:
 class PositionComponent(Component):
     """A position component. It contains three float properties: x, y, z.
     This component can be used to store the position of an Agent in a 1-3D world.
-    It is used by ``DiscreteWorld`` classes to do exactly that.
+    It is used by ``SpaceWorld`` and ``DiscreteWorld`` classes to do exactly that.
+
+    If the component's agent is added to a ``SpaceWorld`` created with ``soa=True``, the coordinates are moved into a
+    row of the environment's ``positions`` array so that the positions of all agents can be read and updated at once
+    using NumPy. They are moved back onto the component when the agent is removed from the environment.
     """
 
-    __slots__ = ['x', 'y', 'z']
+    __slots__ = ['x', 'y', 'z', '_positions', '_index', '_row']
 
     def __init__(self, agent, model, x: float = 0.0, y: float = 0.0, z: float = 0.0) -> None:
         super().__init__(agent, model)
@@ -86,6 +90,78 @@ class PositionComponent(Component):
         return self.get_position()
 
 
+class _BoundPositionComponent(PositionComponent):
+    """The class of a ``PositionComponent`` while its coordinates are stored in row ``_index`` of a ``SpaceWorld``'s
+    ``positions`` array. ``SpaceWorld`` switches components to and from this class as they are bound and unbound. The
+    layouts of both classes are identical, so agents continue to find the component using ``PositionComponent``."""
+
+    __slots__ = []
+
+    def _set_row(self, positions: np.ndarray, index: int):
+        """Makes row ``index`` of ``positions`` hold the component's coordinates."""
+        self._positions = positions
+        self._index = index
+        # Indexing a memoryview is considerably faster than indexing the array and returns Python scalars
+        self._row = memoryview(positions[index])
+
+    def __getstate__(self):
+        # memoryviews cannot be copied or pickled so the row is rebuilt by __setstate__
+        return self.agent, self.model, self._positions, self._index
+
+    def __setstate__(self, state):
+        self.agent, self.model, positions, index = state
+        self._set_row(positions, index)
+
+    def _write(self, axis: int, value: float):
+        """Writes ``value`` to the component's row using NumPy, which casts it to the dtype of ``positions``.
+
+        Raises
+        ------
+        ValueError
+            If ``value`` isn't a whole number but the ``positions`` array stores integers.
+        """
+        if self._positions.dtype.kind in 'iu' and value != int(value):
+            raise ValueError(f'Cannot store the non-integer coordinate {value} in an integer positions array.')
+        self._positions[self._index, axis] = value
+
+    @property
+    def x(self) -> float:
+        return self._row[0]
+
+    @x.setter
+    def x(self, value: float):
+        try:
+            self._row[0] = value
+        except TypeError:  # The memoryview only accepts values of its exact type (e.g. floats for float coordinates)
+            self._write(0, value)
+
+    @property
+    def y(self) -> float:
+        return self._row[1]
+
+    @y.setter
+    def y(self, value: float):
+        try:
+            self._row[1] = value
+        except TypeError:
+            self._write(1, value)
+
+    @property
+    def z(self) -> float:
+        return self._row[2]
+
+    @z.setter
+    def z(self, value: float):
+        try:
+            self._row[2] = value
+        except TypeError:
+            self._write(2, value)
+
+    def get_position(self) -> (float, float, float):
+        """Returns the x,y and z values of the component as a tuple"""
+        return tuple(self._row.tolist())
+
+
 def distance(a: PositionComponent, b: PositionComponent) -> float:
     """Calculates the distance from ``PositionComponent`` a to ``PositionComponent`` b.
 
@@ -152,6 +228,9 @@ class ConstantGenerator:
     value : Any
         The value you want to set your cell component's values to.
     """
+
+    __slots__ = ['value']
+
     def __init__(self, value):
         self.value = value
 
@@ -194,6 +273,9 @@ class LookupGenerator:
     table : Any
         The lookup table.
     """
+
+    __slots__ = ['table']
+
     def __init__(self, table):
         self.table = table
 
@@ -226,11 +308,21 @@ class SpaceWorld(Environment):
     wrap_env : bool
         Determines if the environment is toroidal (i.e. agents wrap around the environment instead of moving out of
         bounds).
+    soa : bool
+        If ``True``, the coordinates of the agents' ``PositionComponent``s are stored in the ``positions`` array
+        (a structure of arrays) rather than on the components themselves.
+    position_dtype : numpy.dtype
+        Class attribute that sets the default dtype of the ``positions`` array used when ``soa`` is ``True``. Defaults
+        to ``numpy.float64``.
     """
-    __slots__ = ['width', 'height', 'depth', 'wrap_env', '_index_offset']
+    __slots__ = ['width', 'height', 'depth', 'wrap_env', 'soa', '_index_offset', '_positions', '_position_components',
+                 '_position_order', '_position_serial']
+
+    position_dtype = np.float64
 
     def __init__(self, model: Model, width: float, height: Optional[float] = 0.0, depth: Optional[float] = 0.0,
-                 id: Optional[str] = 'ENVIRONMENT', wrap_env: Optional[bool] = False):
+                 id: Optional[str] = 'ENVIRONMENT', wrap_env: Optional[bool] = False, position_dtype=None,
+                 soa: Optional[bool] = False):
         """Creates a SpaceWorld environment.
 
         Parameters
@@ -248,13 +340,108 @@ class SpaceWorld(Environment):
         wrap_env : Optional[bool]
             Determines if the environment is toroidal (i.e. agents wrap around the environment instead of moving out of
             bounds).
+        position_dtype : Optional[numpy.dtype]
+            The dtype of the ``positions`` array used when ``soa`` is ``True``. Defaults to the class's
+            ``position_dtype``. If it is an integer dtype, non-integer coordinates raise a ``ValueError``. A smaller
+            dtype such as
+            ``numpy.float32`` halves the memory used by positions (and the memory bandwidth used by vectorized
+            movement) at the cost of precision.
+        soa : Optional[bool]
+            If ``True``, the agents' coordinates are stored in the environment's ``positions`` array. Reading and
+            writing ``positions`` and querying ``get_agents_at()`` become vectorized NumPy operations, but accessing
+            the coordinates of individual ``PositionComponent``s becomes slower. Defaults to ``False``.
         """
         super().__init__(model, id=id)
         self.width = width
         self.height = height
         self.depth = depth
         self.wrap_env = wrap_env
+        self.soa = soa
         self._index_offset = 0  # This property is used manage spatial extents in Discrete vs Continuous Environments
+        # If soa, the coordinates of every agent's PositionComponent. Only the first len(_position_components) rows are
+        # in use
+        self._positions = np.zeros((0, 3), dtype=self.position_dtype if position_dtype is None else position_dtype)
+        # The PositionComponent whose coordinates are stored in the corresponding row of _positions
+        self._position_components = []
+        # The order in which each row's agent was added. Used to return agents in insertion order after rows are swapped
+        self._position_order = np.zeros(0, dtype=np.int64)
+        self._position_serial = 0
+
+    @property
+    def positions(self) -> np.ndarray:
+        """An ``(n, 3)`` array containing the x, y and z coordinates of the n agents in the environment.
+
+        If the environment was created with ``soa=True``, the array is a view, so writing to it moves the agents. This
+        allows the positions of all agents to be updated at once (e.g. ``env.positions[:, 0] += 1.0``). The rows are
+        ordered like ``position_agents`` and that order changes when agents are removed, so the array should not be kept
+        across calls to ``remove_agent()``. Writes are not clamped or wrapped like they are by ``move()``.
+
+        Otherwise, the array is a read-only copy of the agents' coordinates.
+        """
+        if self.soa:
+            return self._positions[:len(self._position_components)]
+
+        positions = np.array([agent[PositionComponent].get_position() for agent in self.position_agents]).reshape(-1, 3)
+        positions.flags.writeable = False
+        return positions
+
+    @property
+    def position_agents(self) -> List[Agent]:
+        """A list containing the agent whose coordinates are stored in the corresponding row of ``positions``."""
+        if self.soa:
+            return [component.agent for component in self._position_components]
+        return [agent for agent in self.agents.values() if PositionComponent in agent]
+
+    def _reserve_positions(self, size: int):
+        """Grows the ``positions`` array (if necessary) so that it has room for at least ``size`` agents."""
+        if size > len(self._positions):
+            # Grow the array and point every bound component at the new one
+            n = len(self._position_components)
+            positions = np.zeros((max(1024, 2 * len(self._positions), size), 3), dtype=self._positions.dtype)
+            positions[:n] = self._positions[:n]
+            self._positions = positions
+            order = np.zeros(len(positions), dtype=np.int64)
+            order[:n] = self._position_order[:n]
+            self._position_order = order
+            for bound in self._position_components:
+                bound._set_row(positions, bound._index)
+
+    def _check_integral(self, positions):
+        """Raises a ``ValueError`` if ``positions`` contains non-integer coordinates but the ``positions`` array stores
+        integers."""
+        if self._positions.dtype.kind in 'iu' and (np.mod(positions, 1) != 0).any():
+            raise ValueError('Cannot store non-integer coordinates in an integer positions array.')
+
+    def _bind_position(self, component: PositionComponent):
+        """Moves the coordinates of ``component`` into a new row of the ``positions`` array."""
+        n = len(self._position_components)
+        self._reserve_positions(n + 1)
+        self._positions[n] = component.get_position()
+        self._position_order[n] = self._position_serial
+        self._position_serial += 1
+        component.__class__ = _BoundPositionComponent
+        component._set_row(self._positions, n)
+        self._position_components.append(component)
+
+    def _unbind_position(self, component: PositionComponent):
+        """Moves the coordinates of ``component`` back onto the component and frees its row of the ``positions``
+        array.
+
+        The last row is moved into the vacated row so that the rows in use stay contiguous.
+        """
+        i = component._index
+        positions = self._positions
+        x, y, z = component._row.tolist()
+        component.__class__ = PositionComponent
+        component._positions = component._row = None
+        component.x, component.y, component.z = x, y, z
+
+        last = self._position_components.pop()
+        if last is not component:
+            positions[i] = positions[len(self._position_components)]
+            self._position_order[i] = self._position_order[len(self._position_components)]
+            last._set_row(positions, i)
+            self._position_components[i] = last
 
     def add_agent(self, agent: Agent, x_pos: int = 0, y_pos: int = 0, z_pos: int = 0):
         """Adds an agent to the environment. Overrides the base ``Environment.add_agent`` class function.
@@ -286,11 +473,76 @@ class SpaceWorld(Environment):
         z_bool = z_pos > self.depth - self._index_offset or z_pos < 0 if self.depth > 0 else False
         if x_bool or y_bool or z_bool:
             raise Exception("Cannot add the Agent to position not on the map.")
+        if self.soa:
+            self._check_integral((x_pos, y_pos, z_pos))
 
         super().add_agent(agent)
-        agent.add_component(PositionComponent(agent, agent.model, x=x_pos, y=y_pos, z=z_pos))
+        component = PositionComponent(agent, agent.model, x=x_pos, y=y_pos, z=z_pos)
+        agent.add_component(component)
+        if self.soa:
+            self._bind_position(component)
 
-    def remove_agent(self, a_id: str):
+    def add_agents(self, agents: Iterable[Agent], positions=None):
+        """Adds several agents to the environment at once. Overrides the base ``Environment.add_agents`` method.
+
+        Like ``SpaceWorld.add_agent``, every agent is given a ``PositionComponent``, but the positions of all of the
+        agents are validated (and, if ``soa`` is ``True``, stored) using a handful of NumPy operations rather than one
+        agent at a time::
+
+            env.add_agents(agents, model.rng.uniform(0, env.width, size=(len(agents), 3)))
+
+        Parameters
+        ----------
+        agents : Iterable[Agent]
+            The agents being added to the environment.
+        positions : array_like, Optional
+            An ``(n, 3)`` array containing the starting x, y and z-positions of the n agents. Defaults to placing all
+            of the agents at ``(0, 0, 0)``.
+
+        Raises
+        ------
+        DuplicateAgentError
+            If an agent already exists in the environment or appears more than once in ``agents``.
+        ValueError
+            If ``positions`` does not contain one row of 3 coordinates for each agent.
+        Exception
+            If any of the agents' initial positions are outside the environment's spacial extents.
+        """
+        agents = list(agents)
+        n = len(agents)
+        if positions is None:
+            positions = np.zeros((n, 3), dtype=self._positions.dtype)
+        else:
+            positions = np.asarray(positions)
+            if positions.shape != (n, 3):
+                raise ValueError(f'positions must have shape ({n}, 3) not {positions.shape}.')
+
+        for axis, extent in enumerate((self.width, self.height, self.depth)):
+            if extent > 0 and ((positions[:, axis] > extent - self._index_offset) | (positions[:, axis] < 0)).any():
+                raise Exception("Cannot add the Agent to position not on the map.")
+        if self.soa:
+            self._check_integral(positions)
+
+        super().add_agents(agents)
+
+        if not self.soa:
+            for agent, (x, y, z) in zip(agents, positions.tolist()):
+                agent.add_component(PositionComponent(agent, agent.model, x, y, z))
+            return
+
+        start = len(self._position_components)
+        self._reserve_positions(start + n)
+        self._positions[start:start + n] = positions
+        self._position_order[start:start + n] = np.arange(self._position_serial, self._position_serial + n)
+        self._position_serial += n
+        for i, agent in enumerate(agents, start):
+            component = PositionComponent(agent, agent.model)
+            agent.add_component(component)
+            component.__class__ = _BoundPositionComponent
+            component._set_row(self._positions, i)
+            self._position_components.append(component)
+
+    def remove_agent(self, a_id: str, release: bool = False):
         """Removes the agent from the environment. Overrides the base ``Environment.remove_agent`` method.
         This method will also remove the ``PositionComponent`` from the agent.
 
@@ -298,16 +550,23 @@ class SpaceWorld(Environment):
         ----------
         a_id : str
             The ``id`` of the agent to remove.
+        release : bool, Optional
+            If ``True``, the agent and its components (including its ``PositionComponent``) are returned to their pools
+            using ``Agent.release()``. Defaults to ``False``.
 
         Raises
         ------
         AgentNotFoundError
             If no agent with an ``agent.id == a_id`` can be found.
         """
-        if a_id in self.agents:
-            self.agents[a_id].remove_component(PositionComponent)
+        agent = self.agents.get(a_id)
+        if agent is not None:
+            component = agent[PositionComponent]
+            if type(component) is _BoundPositionComponent and component._positions is self._positions:
+                self._unbind_position(component)
+            agent.remove_component(PositionComponent, release=release)
 
-        super().remove_agent(a_id)
+        super().remove_agent(a_id, release=release)
 
     def get_agents_at(self, x_pos: float = 0.0, y_pos: float = 0.0, z_pos: float = 0.0, leeway: float = 0.0,
                       x_leeway: float = 0, y_leeway: float = 0, z_leeway: float = 0) -> List[Agent]:
@@ -353,10 +612,24 @@ class SpaceWorld(Environment):
         ymin, ymax = min(y_pos - y_leeway, y_pos - leeway), max(y_pos + y_leeway, y_pos + leeway)
         zmin, zmax = min(z_pos - z_leeway, z_pos - leeway), max(z_pos + z_leeway, z_pos + leeway)
 
-        return [self.agents[agentKey] for agentKey in self.agents
-                if xmin <= self.agents[agentKey][PositionComponent].x <= xmax
-                and ymin <= self.agents[agentKey][PositionComponent].y <= ymax
-                and zmin <= self.agents[agentKey][PositionComponent].z <= zmax]
+        if not self.soa:
+            return [self.agents[agentKey] for agentKey in self.agents
+                    if xmin <= self.agents[agentKey][PositionComponent].x <= xmax
+                    and ymin <= self.agents[agentKey][PositionComponent].y <= ymax
+                    and zmin <= self.agents[agentKey][PositionComponent].z <= zmax]
+
+        # Test every agent's coordinates at once using the positions array
+        positions = self.positions
+        rows = np.flatnonzero((xmin <= positions[:, 0]) & (positions[:, 0] <= xmax)
+                              & (ymin <= positions[:, 1]) & (positions[:, 1] <= ymax)
+                              & (zmin <= positions[:, 2]) & (positions[:, 2] <= zmax))
+
+        # Rows are reordered when agents are removed, so sort the matches back into the order the agents were added
+        if len(rows) > 1:
+            rows = rows[np.argsort(self._position_order[rows])]
+
+        components = self._position_components
+        return [components[row].agent for row in rows.tolist()]
 
     def get_dimensions(self) -> (int, int, int):
         """Returns a 3-tuple containing the extents of the environment:
@@ -507,10 +780,22 @@ class DiscreteWorld(SpaceWorld):
     wrap_env : bool
         Determines if the environment is toroidal (i.e. agents wrap around the environment instead of moving out of
         bounds).
+    soa : bool
+        If ``True``, the coordinates of the agents' ``PositionComponent``s are stored in the ``positions`` array
+        (a structure of arrays) rather than on the components themselves.
+    position_dtype : numpy.dtype
+        Class attribute that sets the dtype of the ``positions`` array used when ``soa`` is ``True``. Defaults to
+        ``numpy.int64`` so that coordinates are read back as ``int``s. In that mode, moving an agent to a non-integer
+        coordinate raises a ``ValueError``.
     """
+
+    __slots__ = ['cells']
+
+    position_dtype = np.int64
+
     def __init__(self, model, width: int, height: Optional[int] = 0, depth: Optional[int] = 0,
-                 id: Optional[str] = 'ENVIRONMENT', wrap_env: Optional[bool] = False):
-        super().__init__(model, width, height, depth, id=id, wrap_env=wrap_env)
+                 id: Optional[str] = 'ENVIRONMENT', wrap_env: Optional[bool] = False, soa: Optional[bool] = False):
+        super().__init__(model, width, height, depth, id=id, wrap_env=wrap_env, soa=soa)
 
         if type(width) != int or type(height) != int or type(depth) != int:
             raise AttributeError(f"DiscreteWorld environment's dimensions must of type (int, int, int) not "
@@ -909,7 +1194,10 @@ class LineWorld(DiscreteWorld):
         bounds).
     """
 
-    def __init__(self, model: Model, width: int, id: str = 'ENVIRONMENT', wrap_env: Optional[bool] = False):
+    __slots__ = []
+
+    def __init__(self, model: Model, width: int, id: str = 'ENVIRONMENT', wrap_env: Optional[bool] = False,
+                 soa: Optional[bool] = False):
         """Initializes a ``LineWorld`` object.
 
         Parameters
@@ -923,6 +1211,9 @@ class LineWorld(DiscreteWorld):
         wrap_env : Optional[bool]
             Determines if the environment is toroidal (i.e. agents wrap around the environment instead of moving out of
             bounds). Defaults to ``False``.
+        soa : Optional[bool]
+            If ``True``, the agents' coordinates are stored in the environment's ``positions`` array. See
+            ``SpaceWorld``. Defaults to ``False``.
 
         Raises
         ------
@@ -933,7 +1224,7 @@ class LineWorld(DiscreteWorld):
         if width < 1:
             raise IndexError("Cannot create a LineWorld with a negative width.")
 
-        super().__init__(model, width, 0, 0, id=id, wrap_env=wrap_env)
+        super().__init__(model, width, 0, 0, id=id, wrap_env=wrap_env, soa=soa)
 
     def get_dimensions(self) -> int:
         """Gets the dimension of the ``LineWorld``.
@@ -969,13 +1260,15 @@ class GridWorld(DiscreteWorld):
         bounds).
     """
 
+    __slots__ = []
+
     def __init__(self, model: Model, width: int, height: int, id: str = 'ENVIRONMENT',
-                 wrap_env: Optional[bool] = False):
+                 wrap_env: Optional[bool] = False, soa: Optional[bool] = False):
 
         if width < 1 or height < 1:
             raise IndexError("Cannot create a GridWorld with a negative width or height.")
 
-        super().__init__(model, width, height, 0, id=id, wrap_env=wrap_env)
+        super().__init__(model, width, height, 0, id=id, wrap_env=wrap_env, soa=soa)
 
     def get_dimensions(self) -> (int, int):
         """Gets the dimension of the ``GridWorld``.
@@ -31,19 +31,17 @@ def generate_changelog(version_type=2):
     performance = []
     fixes = []
 
+    buckets = {'feat': features, 'fix': fixes, 'perf': performance}
+
     for commit in commits:
         try:
             msg, sha = commit.split('\n')
 
-            if msg.startswith('feat:'):
-                msg = msg.replace('feat:', '')
-                features.append((msg, sha))
-            elif msg.startswith('fix:'):
-                msg = msg.replace('fix:', '')
-                fixes.append((msg, sha))
-            elif msg.startswith('perf:'):
-                msg = msg.replace('perf:', '')
-                performance.append((msg, sha))
+            prefix, sep, msg = msg.partition(':')
+            if sep:
+                bucket = buckets.get(prefix)
+                if bucket is not None:
+                    bucket.append((msg, sha))
 
         except ValueError:
             continue
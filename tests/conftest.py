@@ -0,0 +1,29 @@
+import logging
+import pytest
+
+from ECAgent import Core
+from ECAgent.Core import Agent, Model
+
+
+@pytest.fixture(scope='session')
+def _logger():
+    # Resolved once per session. Model() would otherwise look up and reset the 'MODEL' logger for every test
+    logger = logging.getLogger('MODEL')
+    logger.setLevel(logging.INFO)
+    return logger
+
+
+@pytest.fixture
+def model(_logger):
+    # Seeded so get_random_agent results do not depend on which xdist worker runs the test
+    return Model(seed=0, logger=_logger)
+
+
+@pytest.fixture(autouse=True)
+def _isolate():
+    # Class components and released agent and component pools are process wide. Reset them so that tests stay independent of
+    # the order (and worker) pytest-xdist runs them in.
+    yield
+    Agent.components.clear()
+    Core._component_pools.clear()
+    Core._agent_pools.clear()
@@ -1,3 +1,4 @@
+import pickle
 import pytest
 
 import ECAgent.Core as core
@@ -122,6 +123,21 @@ def test_run_model_for_batch():
     assert len(data['c1']) == 10
 
 
+def test_pack_records():
+    # Numeric records are packed and restored
+    for records in [[1, 2, 3], [0.5, 1.5]]:
+        packed = pickle.loads(pickle.dumps(batching._pack_records(records)))
+        assert isinstance(packed, batching._PackedRecords)
+        unpacked = batching._unpack_records(packed)
+        assert unpacked == records
+        assert type(unpacked[0]) == type(records[0])
+
+    # Other records are left unchanged
+    for records in [[], [1, 2.5], [{'a': 1}], [2 ** 70], (1, 2)]:
+        assert batching._pack_records(records) is records
+        assert batching._unpack_records(records) is records
+
+
 def test_batch_run():
     params = {'num_agents': 5, 'timesteps': 20, 'collect': 0}
 
@@ -206,6 +222,28 @@ def test_score_model_for_search():
     with pytest.raises(ValueError):
         batching._score_model_for_search(data, -1)
 
+    # Variance requires at least two records
+    with pytest.raises(batching.stats.StatisticsError):
+        batching._score_model_for_search([1], batching.ScoreMode.MIN_VARIANCE)
+
+
+def test_score_models_for_search():
+    data = batching.np.asarray([[1, 2, 3, 4], [2, 2, 2, 2]], dtype=batching.np.float64)
+
+    assert batching._score_models_for_search(data, batching.ScoreMode.MIN).tolist() == [1, 2]
+    assert batching._score_models_for_search(data, batching.ScoreMode.MAX).tolist() == [4, 2]
+    assert batching._score_models_for_search(data, batching.ScoreMode.MAX_MEAN).tolist() == [2.5, 2]
+    assert batching._score_models_for_search(data, batching.ScoreMode.MIN_SUM).tolist() == [10, 8]
+    assert batching._score_models_for_search(data, batching.ScoreMode.MIN_VARIANCE).tolist() == [5 / 3, 0]
+
+    with pytest.raises(ValueError):
+        batching._score_models_for_search(data, -1)
+
+    # Integer sums don't overflow
+    data = batching.np.full((2, 4), 2 ** 62, dtype=batching.np.int64)
+    data[1, 0] -= 1
+    assert batching._score_models_for_search(data, batching.ScoreMode.MIN_SUM).tolist() == [2 ** 64, 2 ** 64 - 1]
+
 
 def test_grid_search():
     params = {'num_agents': 5, 'timesteps': [5, 10, 15, 20], 'collect': 0}
@@ -223,3 +261,18 @@ def test_grid_search():
     assert p_best['records'] == [20, 20, 20, 20]
     assert len(p_list) == 4
 
+    # NaN scores are never chosen
+    def nan_score_func(model: core.Model):
+        return float('nan') if model.timesteps == 5 else model.timesteps / 10
+
+    p_best, p_list = batching.grid_search(CustomModel, params, nan_score_func)
+    assert p_best['timesteps'] == 10
+    p_best, p_list = batching.grid_search(CustomModel, {'timesteps': [5, 5]}, nan_score_func,
+                                          mode=batching.ScoreMode.MAX)
+    assert p_best is p_list[-1]
+
+    # Integer scores stay exact
+    p_best, p_list = batching.grid_search(CustomModel, params, lambda model: 2 ** 53 + model.timesteps, repetitions=2,
+                                          mode=batching.ScoreMode.MIN_SUM)
+    assert p_best['score'] == 2 ** 54 + 10
+
@@ -1,844 +1,1195 @@
+import copy
 import logging
+import numpy as np
 import pytest
+import random
+import sys
 
 from ECAgent.Core import *
 # Unit testing for src framework
 
 
+# First Mersenne Twister state words produced by seeding with 30
+SEED_30_STATE = random.Random(30).getstate()[1][:2]
+
+# Constructed directly so the logger stays out of logging's global registry
+TEST_LOGGER = logging.Logger('TEST', level=logging.DEBUG)
+
+
 class CustomComponent(Component):
     pass
 
 
-class TestEnvironment:
+class CountingSystem(System):
+
+    def __init__(self, id: str, model: Model, priority, freq, start, end):
+        super().__init__(id, model, priority, freq, start, end)
+        self.counter = 0
+
+    def execute(self):
+        self.counter += 1
+
+
+class RecordingSystem(System):
+    __slots__ = ['executed']
+
+    def __init__(self, id: str, model: Model, freq, start, end):
+        super().__init__(id, model, 0, freq, start, end)
+        self.executed = []
+
+    def execute(self):
+        self.executed.append(self.model.systems.timestep)
+
 
-    def test__init__(self):
-        model = Model()
-        assert len(model.environment.components) == 0
-        assert len(model.environment.agents) == 0
-        assert model.environment.model is model
-        assert model.environment.id == "ENVIRONMENT"
+class CompleteSystem(System):
 
-    def test_add_agent(self):
-        model = Model()
-        agent = Agent("a1", model)
-        agent.add_component(Component(agent, model))
-        model.environment.add_agent(agent)
+    def execute(self):
+        self.model.complete()
 
-        assert len(model.environment.agents) == 1
-        assert model.environment.get_agent(agent.id) == agent
-        assert len(model.systems.component_pools[Component]) == 1
 
-        with pytest.raises(DuplicateAgentError):
+@pytest.fixture(scope='module')
+def shared_model():
+    # Only used by tests that never mutate the model
+    return Model()
+
+
+@pytest.fixture
+def make_agents(model):
+    # Creates agents "a<start>"... each holding a Component, and adds them to the model's environment
+    def make(n: int, start: int = 0):
+        agents = [Agent(f"a{i}", model) for i in range(start, start + n)]
+        components = [Component(agent, model) for agent in agents]
+        for agent, component in zip(agents, components):
+            agent.add_component(component)
             model.environment.add_agent(agent)
+        return agents, components
 
-    def test_remove_agent(self):
-        model = Model()
-        agent = Agent("a1", model)
-        agent.add_component(Component(agent, model))
-        model.environment.add_agent(agent)
-        model.environment.remove_agent(agent.id)
+    return make
 
-        assert len(model.environment.agents) == 0
-        assert Component not in model.systems.component_pools
 
-        with pytest.raises(AgentNotFoundError):
-            model.environment.remove_agent(agent.id)
+@pytest.mark.fast
+def test_environment__init__(model):
+    assert not model.environment.components
+    assert not model.environment.agents
+    assert model.environment.model is model
+    assert model.environment.id == "ENVIRONMENT"
 
-    def test_get_agent(self):
-        model = Model()
-        agent = Agent("a1", model)
 
-        # Not found with no error
-        assert model.environment.get_agent(agent.id) is None
+def test_environment_add_agent(model):
+    agent = Agent("a1", model)
+    agent.add_component(Component(agent, model))
+    model.environment.add_agent(agent)
 
-        # Not found with error
-        with pytest.raises(AgentNotFoundError):
-            model.environment.get_agent(agent.id, True)
+    assert len(model.environment.agents) == 1
+    assert model.environment.get_agent(agent.id) == agent
+    assert len(model.systems.component_pools[Component]) == 1
 
-        # Found
-        model.environment.add_agent(agent)
-        assert model.environment.get_agent(agent.id) == agent
 
-    def test_get_random_agent(self):
+def test_environment_add_agents(model):
+    agents = [Agent(f"a{i}", model) for i in range(3)]
+    agents[0].add_component(CustomComponent(agents[0], model))
+    model.environment.add_agents(agents)
 
-        env = Environment(None)
+    assert list(model.environment.agents.values()) == agents
+    assert model.systems.component_pools[CustomComponent] == [agents[0][CustomComponent]]
 
-        assert env.get_random_agent() is None
+    # Nothing is added if any of the agents is a duplicate
+    new_agent = Agent("new", model)
+    pytest.raises(DuplicateAgentError, model.environment.add_agents, [new_agent, agents[1]])
+    pytest.raises(DuplicateAgentError, model.environment.add_agents, [new_agent, new_agent])
+    assert len(model.environment) == 3
 
-        model = Model()
-        agent1 = Agent("a1", model)
-        agent2 = Agent("a2", model)
 
-        assert model.environment.get_random_agent() is None
+def test_environment_remove_agent(model):
+    agent = Agent("a1", model)
+    agent.add_component(Component(agent, model))
+    model.environment.add_agent(agent)
+    model.environment.remove_agent(agent.id)
 
-        model.environment.add_agent(agent1)
+    assert not model.environment.agents
+    assert Component not in model.systems.component_pools
 
-        assert model.environment.get_random_agent() is agent1
 
-        model.environment.add_agent(agent2)
+def test_environment_remove_agent_release(model):
+    agent = Agent("a1", model)
+    component = CustomComponent(agent, model)
+    agent.add_component(component)
+    model.environment.add_agent(agent)
+    model.environment.remove_agent(agent.id, release=True)
 
-        random_agent = model.environment.get_random_agent()
-        assert random_agent is agent1 or random_agent is agent2
+    # The agent and its components no longer reference each other and both can be reused
+    assert len(agent) == 0
+    assert component.agent is None
+    assert Agent.acquire("a2", model) is agent
+    assert CustomComponent.acquire(agent, model) is component
 
-        # Test Component filter
-        class CustomComponent(Component):
 
-            def __init__(self, a, m):
-                super().__init__(a, m)
+def test_environment_get_agent(model):
+    agent = Agent("a1", model)
 
-        # Test for case in which no agents meet filter requirements
+    # Not found cases are covered by test_missing_lookup
+    model.environment.add_agent(agent)
+    assert model.environment.get_agent(agent.id) == agent
 
-        assert model.environment.get_random_agent(CustomComponent) is None
 
-        # Test case where agent does meet requirement
-        agent1.add_component(CustomComponent(agent1, model))
-        assert model.environment.get_random_agent(CustomComponent) is agent1
+def test_environment_get_random_agent(model):
+    env = Environment(None)
 
-        # Test case with Tag
-        agent1.tag = 1
-        assert model.environment.get_random_agent(tag=1) is agent1
+    assert env.get_random_agent() is None
 
-    def test_get_agents(self):
-        model = Model()
+    agent1 = Agent("a1", model)
+    agent2 = Agent("a2", model)
 
-        # Test empty list is returned when non agents occupy the environment
-        assert model.environment.get_agents() == []
+    assert model.environment.get_random_agent() is None
 
-        # Test list when no filter is supplied but agents do occupy the environment
+    model.environment.add_agent(agent1)
 
-        agent1 = Agent("a1", model)
-        agent2 = Agent("a2", model)
+    assert model.environment.get_random_agent() is agent1
 
-        model.environment.add_agent(agent1)
-        model.environment.add_agent(agent2)
+    model.environment.add_agent(agent2)
 
-        assert model.environment.get_agents() == [agent1, agent2]
+    random_agent = model.environment.get_random_agent()
+    assert random_agent is agent1 or random_agent is agent2
 
-        # Test component filter when no agents meet the filter
-        assert model.environment.get_agents(Component) == []
+    # Test Component filter
+    # Test for case in which no agents meet filter requirements
 
-        # Test component filter when some agents meet the filter
-        agent1.add_component(Component(agent1, model))
-        assert model.environment.get_agents(Component) == [agent1]
+    assert model.environment.get_random_agent(CustomComponent) is None
 
-        # Test tag filter
-        agent1.tag = 1
-        assert model.environment.get_agents(tag=1) == [agent1]
+    # Test case where agent does meet requirement
+    agent1.add_component(CustomComponent(agent1, model))
+    assert model.environment.get_random_agent(CustomComponent) is agent1
 
-    def test_set_model(self):
-        model = Model()
+    # Test case with Tag
+    agent1.tag = 1
+    assert model.environment.get_random_agent(tag=1) is agent1
 
-        env = Environment(None)
-        assert env.model is None
 
-        env.set_model(model)
-        assert env.model is model
+def test_environment_get_random_agents(model):
+    assert model.environment.get_random_agents(3) == []
 
-    def test__len__(self):
-        env = Environment(None)
+    agent1 = Agent("a1", model)
+    agent2 = Agent("a2", model)
+    agent1.add_component(CustomComponent(agent1, model))
+    model.environment.add_agent(agent1)
+    model.environment.add_agent(agent2)
 
-        # Test Empty case
-        assert len(env) == 0
+    agents = model.environment.get_random_agents(10)
+    assert len(agents) == 10
+    assert set(agents) <= {agent1, agent2}
 
-        # Test once agent has been added
-        env.add_agent(Agent("a1", None))
-        assert len(env) == 1
+    # Test Component filter
+    assert model.environment.get_random_agents(3, CustomComponent) == [agent1] * 3
 
-    def test__iter__(self):
-        env = Environment(None)
+    # Test tag filter
+    agent2.tag = 1
+    assert model.environment.get_random_agents(2, tag=1) == [agent2, agent2]
 
-        # Test Empty case
-        i = 0
-        for _ in env:
-            i+=1
+    # Test without replacement
+    assert set(model.environment.get_random_agents(2, replace=False)) == {agent1, agent2}
+    pytest.raises(ValueError, model.environment.get_random_agents, 3, replace=False)
 
-        assert i == 0
 
-        # Test once agent has been added
-        env.add_agent(Agent("a1", None))
-        i = 0
-        for _ in env:
-            i+=1
+def test_environment_get_agents(model):
+    # Test empty list is returned when non agents occupy the environment
+    assert not model.environment.get_agents()
 
-        assert i == 1
+    # Test list when no filter is supplied but agents do occupy the environment
 
-    def test_shuffle(self):
+    agent1 = Agent("a1", model)
+    agent2 = Agent("a2", model)
 
-        model = Model()
+    model.environment.add_agent(agent1)
+    model.environment.add_agent(agent2)
 
-        a1 = Agent("a1", model)
-        a1.add_component(Component(self, model))
-        model.environment.add_agent(a1)
-        model.environment.add_agent(Agent("a2", model))
+    assert model.environment.get_agents() == [agent1, agent2]
 
-        # Test with no template
-        assert len(model.environment.shuffle()) == 2
+    # Test component filter when no agents meet the filter
+    assert not model.environment.get_agents(Component)
 
-        # Test with template
-        assert len(model.environment.shuffle(Component)) == 1
+    # Test component filter when some agents meet the filter
+    agent1.add_component(Component(agent1, model))
+    assert model.environment.get_agents(Component) == [agent1]
 
+    # Test tag filter
+    agent1.tag = 1
+    assert model.environment.get_agents(tag=1) == [agent1]
 
-class TestModel:
 
-    def test__init__(self):
-        model = Model()
-        assert model.environment is not None
-        assert model.systems is not None
-        assert model.random is not None
-        assert model.logger is not None
-        assert model.logger.level == logging.INFO
-        assert model._status == ModelStatus.RUNNING
+def test_environment_get_agents_cache(model):
+    agent1 = Agent("a1", model)
+    agent2 = Agent("a2", model)
+    agent1.add_component(Component(agent1, model))
+    model.environment.add_agent(agent1)
+    model.environment.add_agent(agent2)
 
-        logger = logging.getLogger('TEST')
-        logger.setLevel(logging.DEBUG)
+    result = model.environment.get_agents(Component)
+    assert result == [agent1]
 
-        model = Model(seed=30, logger=logger)
-        assert model.environment is not None
-        assert model.systems is not None
-        assert model.random.randint(25, 50) == 42
-        assert model.logger is logger
-        assert model.logger.level == logging.DEBUG
+    # Mutating a result must not affect later queries
+    result.clear()
+    assert model.environment.get_agents(Component) == [agent1]
+    model.environment.get_agents().clear()
+    assert model.environment.get_agents() == [agent1, agent2]
 
-    def test__getattr__(self):
-        model = Model()
+    # Adding or removing components and agents invalidates cached results
+    agent2.add_component(Component(agent2, model))
+    assert model.environment.get_agents(Component) == [agent1, agent2]
 
-        # Test Error Case
-        with pytest.raises(AttributeError):
-            model.not_an_attribute
+    model.environment.remove_agent(agent1.id)
+    assert model.environment.get_agents(Component) == [agent2]
+    assert model.environment.get_random_agent() is agent2
 
-        # Test timestep
-        model.execute()
-        assert model.timestep == model.systems.timestep
+    agent2.remove_component(Component)
+    assert not model.environment.get_agents(Component)
 
-    def test__bool__(self):
-        model = Model()
-        assert model
-        model._status = ModelStatus.RUNNING
-        assert model
-        model._status = ModelStatus.COMPLETE
-        assert not model
+    # Removed agents are not kept alive by cached results
+    model.environment.get_agents(tag=0)
+    model.environment.remove_agent(agent2.id)
+    assert not model.environment._query_cache
 
-    def test_is_running(self):
-        model = Model()
-        assert model.is_running()
-        model._status = ModelStatus.COMPLETE
-        assert not model.is_running()
 
-    def test_complete(self):
-        model = Model()
-        model.complete()
-        assert model._status == ModelStatus.COMPLETE
+def test_environment_set_model(model):
+    env = Environment(None)
+    assert env.model is None
 
-    def test_set_environment(self):
-        model = Model()
-        new_env = Environment(model)
+    env.set_model(model)
+    assert env.model is model
 
-        model.set_environment(new_env)
-        assert model.environment is new_env
 
-    def test_execute(self):
-        model = Model()
+@pytest.mark.fast
+def test_environment__len__():
+    env = Environment(None)
 
-        # Type Error
-        with pytest.raises(TypeError):
-            model.execute('2')
+    # Test Empty case
+    assert len(env) == 0
 
-        # Value Error
-        with pytest.raises(ValueError):
-            model.execute(-1)
+    # Test once agent has been added
+    env.add_agent(Agent("a1", None))
+    assert len(env) == 1
 
-        # Valid single step
-        model.execute()
-        assert model.systems.timestep == 1
 
-        # Valid multistep
-        model.execute(2)
-        assert model.systems.timestep == 3
+@pytest.mark.fast
+def test_environment__iter__():
+    env = Environment(None)
 
+    # Test Empty case
+    assert list(env) == []
 
-class TestComponent:
+    # Test once agent has been added
+    env.add_agent(Agent("a1", None))
+    assert [a.id for a in env] == ["a1"]
 
-    def test__init__(self):
-        model = Model()
-        agent = Agent("a1", model)
-        component = Component(agent, model)
 
-        assert component.model == model
-        assert component.agent == agent
+def test_environment_shuffle(model):
+    a1 = Agent("a1", model)
+    a1.add_component(Component(a1, model))
+    model.environment.add_agent(a1)
+    model.environment.add_agent(Agent("a2", model))
 
+    # Test with no template
+    assert len(model.environment.shuffle()) == 2
 
-class TestSystem:
+    # Test with template
+    assert len(model.environment.shuffle(Component)) == 1
 
-    def test__init__(self):
-        model = Model()
 
-        system = System("s1",model)
-        assert system.model == model
-        assert system.id == "s1"
-        assert system.start == 0
-        assert system.end == maxsize
-        assert system.frequency == 1
-        assert system.priority == 0
+@pytest.mark.fast
+def test_model__init__():
+    model = Model()
+    assert model.environment is not None
+    assert model.systems is not None
+    assert model.random is not None
+    assert model.logger is not None
+    assert model.logger.level == logging.INFO
+    assert model._status == ModelStatus.RUNNING
 
-    def test_clean_up(self):
-        model = Model()
-        s1 = System("s1", model)
-        model.systems.add_system(s1)
+    model = Model(seed=30, logger=TEST_LOGGER)
+    assert model.environment is not None
+    assert model.systems is not None
+    assert model.random.getstate()[1][:2] == SEED_30_STATE
+    assert model.logger is TEST_LOGGER
+    assert model.logger.level == logging.DEBUG
 
-        s1.clean_up()
-        assert s1.id not in model.systems.systems
 
-    def test_execute(self):
-        s1 = System("s1",None)
+def test_model_rng():
+    # The generator is created lazily and seeded with the model's seed
+    model = Model(seed=30)
+    assert model._rng is None
+    assert model.rng is model.rng
+    assert model.rng.integers(0, 1000, size=5).tolist() == np.random.default_rng(30).integers(0, 1000, size=5).tolist()
 
-        with pytest.raises(NotImplementedError):
-            s1.execute()
 
+def test_model__getattr__(model):
+    # Test Error Case
+    pytest.raises(AttributeError, getattr, model, 'not_an_attribute').match('not recognized')
 
-class TestSystemManager:
+    # Test timestep
+    model.execute()
+    assert model.timestep == model.systems.timestep
 
-    def test__init__(self):
-        model = Model()
 
-        sys_man = SystemManager(model)
-        assert sys_man.model == model
-        assert sys_man.timestep == 0
-        assert len(sys_man.systems) == 0
-        assert len(sys_man.execution_queue) == 0
-        assert len(sys_man.component_pools) == 0
+def test_model__deepcopy__(model):
+    model.systems.add_system(System("s1", model))
+    clone = copy.deepcopy(model)
 
-    def test_add_system(self):
-        model = Model()
-        s1 = System("s1", model)
+    # Back references must point at the clone rather than the original model
+    assert clone.environment.model is clone
+    assert clone.systems.model is clone
+    assert clone.systems['s1'].model is clone
+    assert clone.random.getstate() == model.random.getstate()
+    # Loggers are shared by name
+    assert clone.logger is model.logger
 
-        # Test adding to the end of the queue.
-        model.systems.add_system(s1)
-        assert len(model.systems.execution_queue) == 1
 
-        # Test adding duplicate system.
-        with pytest.raises(KeyError):
-            model.systems.add_system(s1)
+def test_model__bool__(model):
+    assert model
+    model._status = ModelStatus.RUNNING
+    assert model
+    model._status = ModelStatus.COMPLETE
+    assert not model
 
-        # Test adding to the beginning of the queue
-        s2 = System("s2", model, priority=10)
-        model.systems.add_system(s2)
-        assert len(model.systems.execution_queue) == 2
-        assert model.systems.execution_queue[0].id == s2.id
 
-    def test_remove_system(self):
-        model = Model()
-        s1 = System("s1", model)
+def test_model_is_running(model):
+    assert model.is_running()
+    model._status = ModelStatus.COMPLETE
+    assert not model.is_running()
 
-        # Test Error
-        with pytest.raises(SystemNotFoundError):
-            model.systems.remove_system(s1.id)
 
-        model.systems.add_system(s1)
-        model.systems.remove_system(s1.id)
-        assert s1.id not in model.systems.systems
+def test_model_complete(model):
+    model.complete()
+    assert model._status == ModelStatus.COMPLETE
 
-    def test_execute_systems(self):
 
-        class TestSystem(System):
+def test_model_set_environment(model):
+    new_env = Environment(model)
 
-            def __init__(self, id: str, model: Model, priority, freq, start, end):
-                super().__init__(id, model, priority, freq, start, end)
-                self.counter = 0
+    model.set_environment(new_env)
+    assert model.environment is new_env
 
-            def execute(self):
-                self.counter += 1
 
-        class CompleteSystem(System):
-            def execute(self):
-                self.model.complete()
+def test_model_execute(model):
+    # Type Error
+    pytest.raises(TypeError, model.execute, '2').match("'n' must be an integer")
 
-        model = Model()
-        s1 = TestSystem("s1", model, 0, 1, 0, 10)
-        model.systems.add_system(s1)
-        s2 = TestSystem("s2", model, 0, 3, 4, 10000)
-        model.systems.add_system(s2)
+    # Value Error
+    pytest.raises(ValueError, model.execute, -1).match("greater than or equal 1")
 
-        for _ in range(12):
-            model.systems.execute_systems()
+    # Valid single step
+    model.execute()
+    assert model.systems.timestep == 1
 
-        assert model.systems.timestep == 12
-        assert s1.counter == 11
-        assert s2.counter == 3
+    # Valid multistep
+    model.execute(2)
+    assert model.systems.timestep == 3
 
-        # When model is marked as complete while executing a system
-        model.systems.add_system(CompleteSystem('c1', model, priority=10))
 
-        model.systems.execute_systems()  # Should do nothing
-        assert model.systems.timestep == 13
-        assert s1.counter == 11
-        assert s2.counter == 3
+@pytest.mark.fast
+def test_component__init__(shared_model):
+    agent = Agent("a1", shared_model)
+    component = Component(agent, shared_model)
 
-        # While model is marked as complete before a simulation run
-        model.systems.execute_systems()  # Should do nothing
-        assert model.systems.timestep == 13
-        assert s1.counter == 11
-        assert s2.counter == 3
+    assert component.model == shared_model
+    assert component.agent == agent
 
-        # Error case
-        with pytest.raises(ModelCompleteError):
-            model.systems.execute_systems(throw_error=True)
 
-    def test_register_component(self):
-        model = Model()
-        s1 = System("s1", model)
-        model.systems.add_system(s1)
+def test_component_acquire_release(model):
+    agent = Agent("a1", model)
+    CustomComponent.clear_pool()
 
-        assert Component not in model.systems.component_pools.keys()
+    # New component when pool is empty
+    component = CustomComponent.acquire(agent, model)
+    assert type(component) == CustomComponent
+    assert component.agent is agent
+    assert component.model is model
 
-        agent1 = Agent("a1", model)
-        component1 = Component(agent1, model)
-        agent1.add_component(component1)
+    # Released component is reused
+    component.release()
+    assert component.agent is None
+    assert component.model is None
 
-        model.environment.add_agent(agent1)
+    agent2 = Agent("a2", model)
+    assert CustomComponent.acquire(agent2, model) is component
+    assert component.agent is agent2
 
-        assert len(model.systems.component_pools[Component]) == 1
-        assert model.systems.component_pools[Component][0] == component1
+    # Pools are bound by max_pool_size
+    CustomComponent.max_pool_size = 0
+    component.release()
+    assert CustomComponent.acquire(agent2, model) is not component
+    del CustomComponent.max_pool_size
 
-        agent2 = Agent("a2", model)
-        component2 = Component(agent2, model)
-        agent2.add_component(component2)
 
-        model.environment.add_agent(agent2)
+@pytest.mark.fast
+def test_system__init__(model):
+    system = System("s1",model)
+    assert system.model == model
+    assert system.id == "s1"
+    assert system.start == 0
+    assert system.end == maxsize
+    assert system.frequency == 1
+    assert system.priority == 0
 
-        assert len(model.systems.component_pools[Component]) == 2
-        assert model.systems.component_pools[Component][0] == component1
-        assert model.systems.component_pools[Component][1] == component2
 
-        with pytest.raises(KeyError):
-            model.systems.register_component(component1)
+def test_system_clean_up(model):
+    s1 = System("s1", model)
+    model.systems.add_system(s1)
 
-    def test_deregister_component(self):
-        model = Model()
-        s1 = System("s1", model)
-        model.systems.add_system(s1)
+    s1.clean_up()
+    assert s1.id not in model.systems.systems
 
-        assert Component not in model.systems.component_pools.keys()
 
-        agent1 = Agent("a1", model)
-        component1 = Component(agent1, model)
-        agent1.add_component(component1)
-        model.environment.add_agent(agent1)
+def test_system_execute():
+    s1 = System("s1",None)
 
-        agent2 = Agent("a2", model)
-        component2 = Component(agent2, model)
-        agent2.add_component(component2)
-        model.environment.add_agent(agent2)
+    pytest.raises(NotImplementedError, s1.execute)
 
-        # deregister component 2 for basic remove check
-        model.systems.deregister_component(component2)
 
-        assert len(model.systems.component_pools[Component]) == 1
-        assert component2 not in model.systems.component_pools[Component]
-        # deregister a component that doesn't exist in the pool
-        with pytest.raises(KeyError):
-            model.systems.deregister_component(component2)
-        # Empty the component pool. This deletes the pool
-        model.systems.deregister_component(component1)
-        assert Component not in model.systems.component_pools.keys()
-        # Try delete from a pool that doesn't exist
-        with pytest.raises(KeyError):
-            model.systems.deregister_component(component1)
+class ScaleSystem(System):
+    __slots__ = ['values']
 
-    def test_get_components(self):
-        model = Model()
-        s1 = System("s1", model)
-        model.systems.add_system(s1)
+    def __init__(self, id: str, model: Model, values):
+        super().__init__(id, model)
+        self.values = values
 
-        assert model.systems.get_components(Component) is None
+    @staticmethod
+    def kernel(values, factor):
+        values *= factor
 
-        # Error case
-        with pytest.raises(KeyError):
-            model.systems.get_components(Component, True)
+    def kernel_args(self):
+        return self.values, 2.0
 
-        agent1 = Agent("a1", model)
-        component1 = Component(agent1, model)
-        agent1.add_component(component1)
 
-        agent2 = Agent("a2", model)
-        component2 = Component(agent2, model)
-        agent2.add_component(component2)
+def test_system_execute_kernel(model):
+    values = np.arange(4, dtype=np.float64)
+    model.systems.add_system(ScaleSystem('scale', model, values))
 
-        model.environment.add_agent(agent1)
-        model.environment.add_agent(agent2)
+    model.execute(2)
 
-        components = model.systems.get_components(Component)
+    np.testing.assert_array_equal(values, [0.0, 4.0, 8.0, 12.0])
 
-        assert len(components) == 2
-        assert components[0] == component1
-        assert components[1] == component2
 
-    def test__getitem__(self):
-        model = Model()
+def test_system_njit_kernel(model):
+    pytest.importorskip('numba')
 
-        # System return None
-        assert model.systems['s1'] is None
+    class NumbaScaleSystem(ScaleSystem):
 
-        # System throws error
-        with pytest.raises(KeyError):
-             system = model.systems['s1', True]
+        @System.njit_kernel
+        def kernel(values, factor):
+            values *= factor
 
-        # System returns s1
-        s1 = System("s1", model)
-        model.systems.add_system(s1)
+    values = np.ones(3)
+    NumbaScaleSystem('scale', model, values).execute()
 
-        assert model.systems['s1'].id == 's1'
+    np.testing.assert_array_equal(values, [2.0, 2.0, 2.0])
 
-        # Test components return None
-        assert model.systems[Component] is None
+    # Numba options can be supplied
+    class ParallelScaleSystem(ScaleSystem):
 
-        # Test components Error case
-        with pytest.raises(KeyError):
-            component = model.systems[Component, True]
+        @System.njit_kernel(parallel=True)
+        def kernel(values, factor):
+            values *= factor
 
-        # Test get components
-        agent1 = Agent("a1", model)
-        component1 = Component(agent1, model)
-        agent1.add_component(component1)
+    ParallelScaleSystem('scale', model, values).execute()
 
-        agent2 = Agent("a2", model)
-        component2 = Component(agent2, model)
-        agent2.add_component(component2)
+    np.testing.assert_array_equal(values, [4.0, 4.0, 4.0])
 
-        model.environment.add_agent(agent1)
-        model.environment.add_agent(agent2)
 
-        components = model.systems[Component]
+@pytest.mark.fast
+def test_system_manager__init__(model):
+    sys_man = SystemManager(model)
+    assert sys_man.model == model
+    assert sys_man.timestep == 0
+    assert not sys_man.systems
+    assert not sys_man.execution_queue
+    assert not sys_man.component_pools
 
-        assert len(components) == 2
-        assert components[0] == component1
-        assert components[1] == component2
 
+def test_system_manager_add_system(model):
+    s1 = System("s1", model)
 
-class TestMetaAgent:
+    # Test adding to the end of the queue.
+    model.systems.add_system(s1)
+    assert len(model.systems.execution_queue) == 1
 
-    def test__init__(self):
+    # Test adding to the beginning of the queue
+    s2 = System("s2", model, priority=10)
+    model.systems.add_system(s2)
+    assert len(model.systems.execution_queue) == 2
+    assert model.systems.execution_queue[0].id == s2.id
 
-        # Getters
-        assert Agent.id == 'Agent'
-        assert len(Agent.components) == 0
-        assert Agent.tag == 0
+    # Test systems with equal priorities execute in the order they were added
+    s3 = System("s3", model, priority=10)
+    model.systems.add_system(s3)
+    s4 = System("s4", model, priority=5)
+    model.systems.add_system(s4)
+    assert [s.id for s in model.systems.execution_queue] == ['s2', 's3', 's4', 's1']
 
-        # Setters
-        Agent.id = 'NewName'
-        Agent.tag = 1
-        assert Agent.id == 'NewName'
-        assert Agent.tag == 1
 
-        # Reset for other tests
-        Agent.id = 'Agent'
-        Agent.tag = 0
+def test_system_manager_remove_system(model):
+    s1 = System("s1", model)
 
-    def test_add_component(self):
-        model = Model()
-        component = Component(Agent, model)
+    # Test Error
+    pytest.raises(SystemNotFoundError, model.systems.remove_system, s1.id).match('does not exist')
 
-        Agent.add_class_component(component)
-        assert len(Agent.components) == 1
+    model.systems.add_system(s1)
+    model.systems.remove_system(s1.id)
+    assert s1.id not in model.systems.systems
+    assert s1 not in model.systems.execution_queue
 
-        # Second component
-        Agent.add_class_component(CustomComponent(Agent, model))
-        assert len(Agent.components) == 2
+    # Test queue order is maintained after removal
+    for s in [System("s2", model, priority=10), System("s3", model), System("s4", model, priority=5)]:
+        model.systems.add_system(s)
+    model.systems.remove_system("s4")
+    model.systems.add_system(System("s5", model, priority=5))
+    assert [s.id for s in model.systems.execution_queue] == ['s2', 's5', 's3']
 
-        with pytest.raises(ValueError):
-            Agent.add_class_component(component)
 
-        # Cleanup
-        Agent.remove_class_component(Component)
-        Agent.remove_class_component(CustomComponent)
-        assert len(Agent.components) == 0
+@pytest.mark.parametrize('t,expect_s1,expect_s2', [
+    (0, True, False), (3, True, False), (4, True, True), (5, True, False), (7, True, True), (10, True, True),
+    (11, False, False), (13, False, True)
+])
+def test_system_manager_execute_systems_at(model, t, expect_s1, expect_s2):
+    s1 = CountingSystem("s1", model, 0, 1, 0, 10)
+    model.systems.add_system(s1)
+    s2 = CountingSystem("s2", model, 0, 3, 4, 10000)
+    model.systems.add_system(s2)
 
-    def test_remove_component(self):
-        model = Model()
+    model.systems.timestep = t
+    model.systems.execute_systems()
 
-        component = Component(Agent, model)
-        Agent.add_class_component(component)
+    assert model.systems.timestep == t + 1
+    assert s1.counter == expect_s1
+    assert s2.counter == expect_s2
 
-        Agent.remove_class_component(Component)
-        assert len(Agent.components) == 0
 
-        with pytest.raises(ComponentNotFoundError):
-            Agent.remove_class_component(Component)
+def test_system_manager_execute_systems(model):
+    s1 = CountingSystem("s1", model, 0, 1, 0, 10)
+    model.systems.add_system(s1)
+    s2 = CountingSystem("s2", model, 0, 3, 4, 10000)
+    model.systems.add_system(s2)
 
-    def test_get_component(self):
-        model = Model()
+    # Both systems are scheduled to run at timestep 7 (see test_system_manager_execute_systems_at)
+    model.systems.timestep = 7
 
-        # Checks  to see if getting a component that doesn't exist returns None
-        assert Agent.get_class_component(Component) is None
+    # When model is marked as complete while executing a system
+    model.systems.add_system(CompleteSystem('c1', model, priority=10))
 
-        # Checks the same argument but it should throw an error instead.
-        with pytest.raises(ComponentNotFoundError):
-            Agent.get_class_component(Component, True)
+    model.systems.execute_systems()  # Should do nothing
+    assert model.systems.timestep == 8
+    assert s1.counter == 0
+    assert s2.counter == 0
 
-        component = Component(Agent, model)
-        Agent.add_class_component(component)
-        # Check to see if getting a component that does exist returns the component
-        assert Agent.get_class_component(Component) is component
+    # While model is marked as complete before a simulation run
+    model.systems.execute_systems()  # Should do nothing
+    assert model.systems.timestep == 8
+    assert s1.counter == 0
+    assert s2.counter == 0
 
-        # Cleanup
-        Agent.remove_class_component(Component)
-        assert len(Agent.components) == 0
+    # Error case
+    pytest.raises(ModelCompleteError, model.systems.execute_systems, throw_error=True).match('ModelStatus.COMPLETE')
 
-    def test__getitem__(self):
-        model = Model()
 
-        # Checks  to see if getting a component that doesn't exist returns None
-        assert Agent[Component] is None
+def test_system_manager_execute_systems_schedule(model):
+    s1 = RecordingSystem("s1", model, 3, 4, 13)
+    s2 = RecordingSystem("s2", model, 2, 5, 9)
+    model.systems.add_system(s1)
+    model.systems.add_system(s2)
 
-        component = Component(Agent, model)
-        Agent.add_class_component(component)
-        # Check to see if getting a component that does exist returns the component
-        assert Agent[Component] is component
+    model.execute(20)
 
-        # Cleanup
-        Agent.remove_class_component(Component)
-        assert len(Agent.components) == 0
+    # Systems execute every 'frequency' timesteps counting from 'start' until 'end' (inclusive)
+    assert s1.executed == [4, 7, 10, 13]
+    assert s2.executed == [5, 7, 9]
 
-    def test__len__(self):
-        model = Model()
 
-        # Test empty case
-        assert len(Agent) == 0
+def test_system_manager_execute_systems_default_schedule(model):
+    s1 = RecordingSystem("s1", model, 1, 0, sys.maxsize)
+    s2 = RecordingSystem("s2", model, 2, 1, 5)
+    model.systems.add_system(s1)
 
-        # Test case when component is added
-        Agent.add_class_component(Component(Agent, model))
-        assert len(Agent) == 1
+    # Systems with the default schedule execute every timestep
+    model.execute(3)
+    assert s1.executed == [0, 1, 2]
 
-        # Cleanup
-        Agent.remove_class_component(Component)
-        assert len(Agent.components) == 0
+    # A custom schedule is still honoured once added alongside a default one
+    model.systems.add_system(s2)
+    model.execute(4)
+    assert s1.executed == [0, 1, 2, 3, 4, 5, 6]
+    assert s2.executed == [3, 5]
 
-    def test_has_component(self):
-        model = Model()
+    # Completing the model stops the remaining systems in the same timestep
+    model.systems.remove_system('s2')
+    model.systems.add_system(CompleteSystem('c1', model, priority=10))
+    model.systems.execute_systems()
+    assert model.systems.timestep == 8
+    assert s1.executed == [0, 1, 2, 3, 4, 5, 6]
 
-        # False check
-        assert not Agent.has_class_component(Component)
 
-        component = Component(Agent, model)
-        Agent.add_class_component(component)
-        # True check
-        assert Agent.has_class_component(Component)
+def test_system_manager_execute_systems_schedule_changes(model):
+    s1 = RecordingSystem("s1", model, 1, 0, sys.maxsize)
+    model.systems.add_system(s1)
 
-        # Check for multiple components
-        # Test on multiple components (with one or missing)
-        assert not Agent.has_class_component(Component, TestComponent)
+    # Changes made after a system is added take effect immediately
+    s1.end = 4
+    s1.frequency = 2
+    model.execute(10)
+    assert s1.executed == [0, 2, 4]
 
-        # Test should pass on multiple components
-        Agent.add_class_component(CustomComponent(Agent, model))
+    s1.start = 10
+    s1.end = sys.maxsize
+    s1.frequency = 1
+    model.execute(2)
+    assert s1.executed == [0, 2, 4, 10, 11]
 
-        assert Agent.has_class_component(Component, CustomComponent)
-        # Cleanup
-        Agent.remove_class_component(Component)
-        Agent.remove_class_component(CustomComponent)
-        assert len(Agent.components) == 0
+    s1.start = 0
+    model.execute(1)
+    assert s1.executed == [0, 2, 4, 10, 11, 12]
 
-    def test__contains__(self):
-        model = Model()
 
-        # False check
-        assert Component not in Agent
+def test_system_manager_register_component(model, make_agents):
+    s1 = System("s1", model)
+    model.systems.add_system(s1)
 
-        component = Component(Agent, model)
-        Agent.add_class_component(component)
-        # True check
-        assert Component in Agent
+    assert Component not in model.systems.component_pools.keys()
 
-        # Cleanup
-        Agent.remove_class_component(Component)
-        assert len(Agent.components) == 0
+    _, (component1,) = make_agents(1)
 
+    assert len(model.systems.component_pools[Component]) == 1
+    assert model.systems.component_pools[Component][0] == component1
 
-class TestAgent:
+    _, (component2,) = make_agents(1, start=1)
 
-    def test__init__(self):
-        model = Model()
+    assert len(model.systems.component_pools[Component]) == 2
+    assert model.systems.component_pools[Component][0] == component1
+    assert model.systems.component_pools[Component][1] == component2
 
-        # Without tag
-        agent = Agent("a1", model)
 
-        assert agent.model == model
-        assert agent.id == "a1"
-        assert len(agent.components) == 0
-        assert agent.tag == 0
+def test_system_manager_deregister_component(model, make_agents):
+    s1 = System("s1", model)
+    model.systems.add_system(s1)
 
-        # With tag
-        agent = Agent("a2", model, tag=1)
+    assert Component not in model.systems.component_pools.keys()
 
-        assert agent.model == model
-        assert agent.id == "a2"
-        assert len(agent.components) == 0
-        assert agent.tag == 1
+    _, (component1, component2) = make_agents(2)
 
-        # With Custom Meta tag
-        Agent.tag = 2
-        agent = Agent('a3', model)
-        assert agent.model == model
-        assert agent.id == 'a3'
-        assert len(agent.components) == 0
-        assert agent.tag == 2
+    # deregister component 2 for basic remove check
+    model.systems.deregister_component(component2)
 
-    def test_add_component(self):
-        model = Model()
-        agent = Agent("a1", model)
-        s1 = System("s1", model)
-        model.systems.add_system(s1)
+    assert len(model.systems.component_pools[Component]) == 1
+    assert component2 not in model.systems.component_pools[Component]
+    # deregister a component that doesn't exist in the pool
+    pytest.raises(KeyError, model.systems.deregister_component, component2).match('Cannot deregister')
+    # Empty the component pool. This deletes the pool
+    model.systems.deregister_component(component1)
+    assert Component not in model.systems.component_pools.keys()
 
-        component = Component(agent, model)
 
-        agent.add_component(component)
-        assert len(agent.components) == 1
+def test_system_manager_deregister_component_swaps_last(model, make_agents):
+    _, (c0, c1, c2) = make_agents(3)
 
-        with pytest.raises(ValueError):
-            agent.add_component(component)
+    # The last component fills the vacated slot
+    model.systems.deregister_component(c0)
+    assert model.systems.component_pools[Component] == [c2, c1]
+
+    # Moved components can still be deregistered
+    model.systems.deregister_component(c2)
+    assert model.systems.component_pools[Component] == [c1]
+    pytest.raises(KeyError, model.systems.deregister_component, c2).match('Cannot deregister')
+
+
+def test_system_manager_get_components(model, make_agents):
+    s1 = System("s1", model)
+    model.systems.add_system(s1)
+
+    _, (component1, component2) = make_agents(2)
+
+    components = model.systems.get_components(Component)
+
+    assert len(components) == 2
+    assert components[0] == component1
+    assert components[1] == component2
+
+
+def test_system_manager_get_components_include_subclasses(model, make_agents):
+    # No subclasses registered yet
+    _, (component1,) = make_agents(1)
+    assert model.systems.get_components(Component, include_subclasses=True) == [component1]
+    # A new list is returned rather than the component pool itself
+    assert model.systems.get_components(Component, include_subclasses=True) is not \
+        model.systems.get_components(Component)
+
+    agent2 = Agent("b1", model)
+    component2 = CustomComponent(agent2, model)
+    agent2.add_component(component2)
+    model.environment.add_agent(agent2)
+
+    # Exact type matching remains the default
+    assert model.systems.get_components(Component) == [component1]
+    assert model.systems.get_components(Component, include_subclasses=True) == [component1, component2]
+    assert model.systems.get_components(CustomComponent, include_subclasses=True) == [component2]
+    assert model.systems.get_components(CustomComponent, include_subclasses=True) is not \
+        model.systems.get_components(CustomComponent)
+
+    # Subclass components are still found once the base type's pool is gone
+    model.systems.deregister_component(component1)
+    assert model.systems.get_components(Component) is None
+    assert model.systems.get_components(Component, include_subclasses=True) == [component2]
+
+    model.systems.deregister_component(component2)
+    assert model.systems.get_components(Component, include_subclasses=True) is None
+    pytest.raises(KeyError, model.systems.get_components, Component, True, True)
+
+
+def test_system_manager__getitem__(model):
+    # System returns s1
+    s1 = System("s1", model)
+    model.systems.add_system(s1)
+
+    assert model.systems['s1'].id == 's1'
+
+    # Test get components
+    agent1 = Agent("a1", model)
+    component1 = Component(agent1, model)
+    agent1.add_component(component1)
+
+    agent2 = Agent("a2", model)
+    component2 = Component(agent2, model)
+    agent2.add_component(component2)
+
+    model.environment.add_agent(agent1)
+    model.environment.add_agent(agent2)
+
+    components = model.systems[Component]
+
+    assert len(components) == 2
+    assert components[0] == component1
+    assert components[1] == component2
+
+
+@pytest.mark.fast
+def test_meta_agent__init__():
+    # Getters
+    assert Agent.id == 'Agent'
+    assert not Agent.components
+    assert Agent.tag == 0
+
+    # Setters
+    Agent.id = 'NewName'
+    Agent.tag = 1
+    assert Agent.id == 'NewName'
+    assert Agent.tag == 1
+
+    # Reset for other tests
+    Agent.id = 'Agent'
+    Agent.tag = 0
+
+
+def test_meta_agent_add_component(model):
+    component = Component(Agent, model)
+
+    Agent.add_class_component(component)
+    assert len(Agent.components) == 1
+
+    # Second component
+    Agent.add_class_component(CustomComponent(Agent, model))
+    assert len(Agent.components) == 2
+
+    pytest.raises(ValueError, Agent.add_class_component, component).match('already has a component')
+
+    # Cleanup
+    Agent.remove_class_component(Component)
+    Agent.remove_class_component(CustomComponent)
+    assert not Agent.components
+
+
+def test_meta_agent_remove_component(model):
+    component = Component(Agent, model)
+    Agent.add_class_component(component)
+
+    Agent.remove_class_component(Component)
+    assert not Agent.components
+
+    pytest.raises(ComponentNotFoundError, Agent.remove_class_component, Component).match('does not have a component')
+
+
+def test_meta_agent_get_component(model):
+    component = Component(Agent, model)
+    Agent.add_class_component(component)
+    # Check to see if getting a component that does exist returns the component
+    assert Agent.get_class_component(Component) is component
+
+    # Cleanup
+    Agent.remove_class_component(Component)
+    assert not Agent.components
+
+
+def test_meta_agent__getitem__(model):
+    component = Component(Agent, model)
+    Agent.add_class_component(component)
+    # Check to see if getting a component that does exist returns the component
+    assert Agent[Component] is component
+
+    # Cleanup
+    Agent.remove_class_component(Component)
+    assert not Agent.components
+
+
+@pytest.mark.fast
+def test_meta_agent__len__(model):
+    # Test empty case
+    assert len(Agent) == 0
+
+    # Test case when component is added
+    Agent.add_class_component(Component(Agent, model))
+    assert len(Agent) == 1
+
+    # Cleanup
+    Agent.remove_class_component(Component)
+    assert not Agent.components
+
+
+def test_meta_agent_has_component(model):
+    # False check
+    assert not Agent.has_class_component(Component)
+
+    component = Component(Agent, model)
+    Agent.add_class_component(component)
+    # True check
+    assert Agent.has_class_component(Component)
+
+    # Check for multiple components
+    # Test on multiple components (with one or missing)
+    assert not Agent.has_class_component(Component, CustomComponent)
+
+    # Test should pass on multiple components
+    Agent.add_class_component(CustomComponent(Agent, model))
+
+    assert Agent.has_class_component(Component, CustomComponent)
+    # Cleanup
+    Agent.remove_class_component(Component)
+    Agent.remove_class_component(CustomComponent)
+    assert not Agent.components
+
+
+@pytest.mark.fast
+def test_meta_agent__contains__(model):
+    # False check
+    assert Component not in Agent
+
+    component = Component(Agent, model)
+    Agent.add_class_component(component)
+    # True check
+    assert Component in Agent
+
+    # Cleanup
+    Agent.remove_class_component(Component)
+    assert not Agent.components
+
+
+@pytest.mark.fast
+def test_agent__init__(model):
+    # Without tag
+    agent = Agent("a1", model)
+
+    assert agent.model == model
+    assert agent.id == "a1"
+    assert not agent.components
+    assert agent.tag == 0
+
+    # With tag
+    agent = Agent("a2", model, tag=1)
+
+    assert agent.model == model
+    assert agent.id == "a2"
+    assert not agent.components
+    assert agent.tag == 1
+
+    # Ids are interned
+    agent = Agent(''.join(['a', '4']), model)
+    assert agent.id is sys.intern('a4')
+
+    # With Custom Meta tag
+    Agent.tag = 2
+    agent = Agent('a3', model)
+    assert agent.model == model
+    assert agent.id == 'a3'
+    assert not agent.components
+    assert agent.tag == 2
+
+
+def test_agent_acquire_release(model):
+    # New agent when pool is empty
+    agent = Agent.acquire("a1", model, tag=2)
+    assert type(agent) == Agent
+    assert agent.id == "a1"
+    assert agent.tag == 2
 
-    def test_remove_component(self):
-        model = Model()
-        agent = Agent("a1", model)
-        s1 = System("s1", model)
-        model.systems.add_system(s1)
+    # Released agent (and its components) are reused
+    component = CustomComponent(agent, model)
+    agent.add_component(component)
+    agent.release()
+    assert agent.model is None
+    assert len(agent) == 0
+    assert component.agent is None
 
-        component = Component(agent, model)
-        agent.add_component(component)
+    agent2 = Agent.acquire("a2", model)
+    assert agent2 is agent
+    assert agent2.id == "a2"
+    assert agent2.model is model
+    assert agent2.tag == Agent.tag
 
-        agent.remove_component(Component)
-        assert len(agent.components) == 0
+    # Pools are bound by max_pool_size
+    Agent.max_pool_size = 0
+    agent.release()
+    assert Agent.acquire("a3", model) is not agent
+    Agent.max_pool_size = 1024
 
-        with pytest.raises(ComponentNotFoundError):
-            agent.remove_component(Component)
 
-    def test_get_component(self):
-        model = Model()
-        agent = Agent("a1", model)
+def test_agent_add_component(model):
+    agent = Agent("a1", model)
+    s1 = System("s1", model)
+    model.systems.add_system(s1)
 
-        # Checks  to see if getting a component that doesn't exist returns None
-        assert agent.get_component(Component) is None
+    component = Component(agent, model)
 
-        # Checks the same argument but it should throw an error instead.
-        with pytest.raises(ComponentNotFoundError):
-            agent.get_component(Component, True)
+    agent.add_component(component)
+    assert len(agent.components) == 1
 
-        component = Component(agent, model)
-        agent.add_component(component)
-        # Check to see if getting a component that does exist returns the component
-        assert agent.get_component(Component) is component
 
-    def test__getitem__(self):
-        model = Model()
-        agent = Agent("a1", model)
+def test_agent_remove_component(model):
+    agent = Agent("a1", model)
+    s1 = System("s1", model)
+    model.systems.add_system(s1)
 
-        # Checks  to see if getting a component that doesn't exist returns None
-        assert agent[Component] is None
+    component = Component(agent, model)
+    agent.add_component(component)
 
-        component = Component(agent, model)
-        agent.add_component(component)
-        # Check to see if getting a component that does exist returns the component
-        assert agent[Component] is component
+    agent.remove_component(Component)
+    assert not agent.components
 
-    def test__len__(self):
-        model = Model()
-        agent = Agent("a1", model)
+    # Released components are recycled
+    CustomComponent.clear_pool()
+    component = CustomComponent(agent, model)
+    agent.add_component(component)
+    agent.remove_component(CustomComponent, release=True)
+    assert CustomComponent.acquire(agent, model) is component
 
-        # Test empty case
-        assert len(agent) == 0
+    # Registered components are deregistered before they are released
+    model.environment.add_agent(agent)
+    agent.add_component(CustomComponent.acquire(agent, model))
+    model.systems.register_component(agent[CustomComponent])
+    agent.remove_component(CustomComponent, release=True)
+    assert model.systems.get_components(CustomComponent) is None
+    agent2 = Agent("a2", model)
+    agent2.add_component(CustomComponent.acquire(agent2, model))
+    model.environment.add_agent(agent2)
+    assert model.systems.get_components(CustomComponent) == [agent2[CustomComponent]]
 
-        # Test case when component is added
-        agent.add_component(Component(agent, model))
-        assert len(agent) == 1
 
-    def test_has_component(self):
-        model = Model()
-        agent = Agent("a1", model)
+def test_agent_get_component(model):
+    agent = Agent("a1", model)
 
-        # False check
-        assert not agent.has_component(Component)
+    component = Component(agent, model)
+    agent.add_component(component)
+    # Check to see if getting a component that does exist returns the component
+    assert agent.get_component(Component) is component
 
-        component = Component(agent, model)
-        agent.add_component(component)
-        # True check
-        assert agent.has_component(Component)
 
-        # Check for multiple components
+def test_agent__getitem__(model):
+    agent = Agent("a1", model)
 
-        class CustomComponent(Component):
+    component = Component(agent, model)
+    agent.add_component(component)
+    # Check to see if getting a component that does exist returns the component
+    assert agent[Component] is component
 
-            def __init__(self, a, m):
-                super().__init__(a, m)
 
-        # Test on multiple components (with one or missing)
-        assert not agent.has_component(Component, TestComponent)
+@pytest.mark.fast
+def test_agent__len__(model):
+    agent = Agent("a1", model)
 
-        # Test should pass on multiple components
-        agent.add_component(CustomComponent(agent,model))
+    # Test empty case
+    assert len(agent) == 0
 
-        assert agent.has_component(Component, CustomComponent)
+    # Test case when component is added
+    agent.add_component(Component(agent, model))
+    assert len(agent) == 1
 
-    def test__contains__(self):
-        model = Model()
-        agent = Agent("a1", model)
 
-        # False check
-        assert Component not in agent
+def test_agent_has_component(model):
+    agent = Agent("a1", model)
 
-        component = Component(agent, model)
-        agent.add_component(component)
-        # True check
-        assert Component in agent
+    # False check
+    assert not agent.has_component(Component)
 
+    component = Component(agent, model)
+    agent.add_component(component)
+    # True check
+    assert agent.has_component(Component)
 
-class TestAgentNotFoundError:
+    # Check for multiple components
+    # Test on multiple components (with one or missing)
+    assert not agent.has_component(Component, CustomComponent)
 
-    def test__init__(self):
-        model = Model()
+    # Test should pass on multiple components
+    agent.add_component(CustomComponent(agent,model))
 
-        error = AgentNotFoundError('a', model.environment)
+    assert agent.has_component(Component, CustomComponent)
 
-        assert error.a_id == 'a'
-        assert error.environment == model.environment
-        assert error.message == 'Agent "a" could not be found in Environment "ENVIRONMENT"'
 
+@pytest.mark.fast
+def test_agent__contains__(model):
+    agent = Agent("a1", model)
 
-class TestDuplicateAgentError:
+    # False check
+    assert Component not in agent
 
-    def test__init__(self):
-        model = Model()
+    component = Component(agent, model)
+    agent.add_component(component)
+    # True check
+    assert Component in agent
 
-        error = DuplicateAgentError('a', model.environment)
 
-        assert error.a_id == 'a'
-        assert error.environment == model.environment
-        assert error.message == 'Agent "a" already exists in Environment "ENVIRONMENT"'
+# Maps the snake_case API onto its deprecated camelCase aliases
+LEGACY_API = {
+    'add_component': 'addComponent', 'remove_component': 'removeComponent', 'get_component': 'getComponent',
+    'has_component': 'hasComponent', 'add_system': 'addSystem', 'remove_system': 'removeSystem',
+    'execute_systems': 'executeSystems', 'get_components': 'getComponents', 'add_agent': 'addAgent',
+    'remove_agent': 'removeAgent', 'get_agent': 'getAgent', 'get_random_agent': 'getRandomAgent',
+    'get_agents': 'getAgents'
+}
 
 
-class TestComponentNotFoundError:
+@pytest.fixture(params=[None, LEGACY_API], ids=['snake_case', 'camelCase'])
+def api(request):
+    names = request.param
 
-    def test__init__(self):
-        model = Model()
-        agent = Agent('a', model)
+    def call(obj, name, *args):
+        return getattr(obj, names[name] if names else name)(*args)
 
-        error = ComponentNotFoundError(agent, Component)
+    return call
 
-        assert error.agent is agent
-        assert error.component_type == Component
-        assert error.message == 'Agent a does not have a component of type <class \'ECAgent.Core.Component\'>.'
 
+@pytest.mark.filterwarnings('ignore::DeprecationWarning')
+def test_api_lifecycle(model, api):
+    env = model.environment
+    agent = Agent("a1", model)
+    component = Component(agent, model)
 
-class TestSystemNotFoundError:
+    api(agent, 'add_component', component)
+    assert api(agent, 'has_component', Component)
+    assert api(agent, 'get_component', Component) is component
 
-    def test__init__(self):
+    api(env, 'add_agent', agent)
+    assert api(env, 'get_agent', agent.id) is agent
+    assert api(env, 'get_agents') == [agent]
+    assert api(env, 'get_random_agent') is agent
+    assert api(model.systems, 'get_components', Component) == [component]
 
-        error = SystemNotFoundError('s1')
+    api(model.systems, 'add_system', System("s1", model))
+    api(model.systems, 'remove_system', "s1")
+    api(model.systems, 'execute_systems')
+    assert model.systems.timestep == 1
 
-        assert error.s_id == 's1'
-        assert error.message == 'System with id "s1" does not exist.'
+    api(env, 'remove_agent', agent.id)
+    api(agent, 'remove_component', Component)
+    assert not api(agent, 'has_component', Component)
 
 
-class TestModelCompleteError:
+def test_legacy_api_is_deprecated(model):
+    with pytest.deprecated_call():
+        model.environment.getAgents()
 
-    def test__init__(self):
 
-        error = ModelCompleteError()
-        assert error.message == 'execute_systems() was called on a model with status "ModelStatus.COMPLETE".'
+# Each row is (getter(model, agent, throw_error), error raised when throw_error is True)
+MISSING_LOOKUPS = [
+    (lambda m, a, t: m.environment.get_agent(a.id, t), AgentNotFoundError),
+    (lambda m, a, t: a.get_component(Component, t), ComponentNotFoundError),
+    (lambda m, a, t: a[Component] if not t else a.get_component(Component, t), ComponentNotFoundError),
+    (lambda m, a, t: Agent.get_class_component(Component, t), ComponentNotFoundError),
+    (lambda m, a, t: Agent[Component] if not t else Agent.get_class_component(Component, t), ComponentNotFoundError),
+    (lambda m, a, t: m.systems.get_components(Component, t), KeyError),
+    (lambda m, a, t: m.systems[Component, t], KeyError),
+    (lambda m, a, t: m.systems['s1', t], KeyError),
+]
+
+
+@pytest.mark.parametrize('getter,raise_type', MISSING_LOOKUPS, ids=[
+    'Environment.get_agent', 'Agent.get_component', 'Agent.__getitem__', '_MetaAgent.get_class_component',
+    '_MetaAgent.__getitem__', 'SystemManager.get_components', 'SystemManager.__getitem__[type]',
+    'SystemManager.__getitem__[str]'
+])
+def test_missing_lookup(model, getter, raise_type):
+    agent = Agent("a1", model)
+
+    # Not found with no error
+    assert getter(model, agent, False) is None
+
+    # Not found with error
+    pytest.raises(raise_type, getter, model, agent, True)
+
+
+# Each row is (setup(model, agent), op(model, agent), error raised the second time op is applied, message pattern)
+DOUBLE_OPS = [
+    (None, lambda m, a: m.environment.add_agent(a), DuplicateAgentError, 'already exists'),
+    (lambda m, a: m.environment.add_agent(a), lambda m, a: m.environment.remove_agent(a.id), AgentNotFoundError,
+     'could not be found'),
+    (None, lambda m, a: m.systems.add_system(System('s1', m)), KeyError, 'already registered'),
+    (lambda m, a: m.systems.add_system(System('s1', m)), lambda m, a: m.systems.remove_system('s1'),
+     SystemNotFoundError, 'does not exist'),
+    (None, lambda m, a: m.systems.register_component(a[Component]), KeyError, 'already registered'),
+    (lambda m, a: m.systems.register_component(a[Component]), lambda m, a: m.systems.deregister_component(a[Component]),
+     KeyError, 'No components with type'),
+    (None, lambda m, a: a.add_component(CustomComponent(a, m)), ValueError, 'already has a component'),
+    (None, lambda m, a: a.remove_component(Component), ComponentNotFoundError, 'does not have a component'),
+]
+
+
+@pytest.mark.parametrize('setup,op,raise_type,match', DOUBLE_OPS, ids=[
+    'Environment.add_agent', 'Environment.remove_agent', 'SystemManager.add_system', 'SystemManager.remove_system',
+    'SystemManager.register_component', 'SystemManager.deregister_component', 'Agent.add_component',
+    'Agent.remove_component'
+])
+def test_double_op_raises(model, setup, op, raise_type, match):
+    agent = Agent("a1", model)
+    agent.add_component(Component(agent, model))
+
+    if setup is not None:
+        setup(model, agent)
+
+    # First application succeeds
+    op(model, agent)
+
+    # Second application raises
+    pytest.raises(raise_type, op, model, agent).match(match)
+
+
+# Messages of the errors built by ERROR_CASES
+EXPECTED_MESSAGES = {
+    AgentNotFoundError: 'Agent "a" could not be found in Environment "ENVIRONMENT"',
+    DuplicateAgentError: 'Agent "a" already exists in Environment "ENVIRONMENT"',
+    ComponentNotFoundError: 'Agent a does not have a component of type <class \'ECAgent.Core.Component\'>.',
+    SystemNotFoundError: 'System with id "s1" does not exist.',
+    ModelCompleteError: 'execute_systems() was called on a model with status "ModelStatus.COMPLETE".',
+}
+
+# Each row is (error type, args(model), {attribute: index of the arg it stores})
+ERROR_CASES = [
+    (AgentNotFoundError, lambda m: ('a', m.environment), {'a_id': 0, 'environment': 1}),
+    (DuplicateAgentError, lambda m: ('a', m.environment), {'a_id': 0, 'environment': 1}),
+    (ComponentNotFoundError, lambda m: (Agent('a', m), Component), {'agent': 0, 'component_type': 1}),
+    (SystemNotFoundError, lambda m: ('s1',), {'s_id': 0}),
+    (ModelCompleteError, lambda m: (), {}),
+]
+
+
+@pytest.mark.fast
+@pytest.mark.parametrize('cls,args,attrs', ERROR_CASES, ids=[case[0].__name__ for case in ERROR_CASES])
+def test_error__init__(shared_model, cls, args, attrs):
+    args = args(shared_model)
+    error = cls(*args)
+
+    for attr, index in attrs.items():
+        assert getattr(error, attr) is args[index]
+    assert error.message == EXPECTED_MESSAGES[cls]
+    assert str(error) == EXPECTED_MESSAGES[cls]
@@ -1,3 +1,7 @@
+import numpy as np
+import pickle
+import pytest
+
 from ECAgent.Core import Agent
 from ECAgent.Collectors import *
 
@@ -30,6 +34,39 @@ class TestCollector:
         assert col.priority == 100
         assert len(col.records) == 0
 
+    def test_preallocate(self):
+        model = Model()
+        col = Collector("Collector", model)
+
+        col.preallocate(2, dtype=np.int64)
+        assert isinstance(col.records, RecordBuffer)
+        assert len(col.records) == 0
+
+        # Buffer grows when full
+        for i in range(5):
+            col.records.append(i)
+        assert len(col.records) == 5
+        assert col.records[4] == 4
+        assert col.records.array.dtype == np.int64
+        assert col.records.tolist() == [0, 1, 2, 3, 4]
+        assert list(col.records) == [0, 1, 2, 3, 4]
+
+        # Only records are pickled
+        records = pickle.loads(pickle.dumps(col.records))
+        assert records.tolist() == [0, 1, 2, 3, 4]
+        records.append(5)
+        assert records.tolist() == [0, 1, 2, 3, 4, 5]
+
+        col.records.clear()
+        assert len(col.records) == 0
+
+    def test_dtype(self):
+        model = Model()
+
+        col = Collector("Collector", model, dtype=np.int32)
+        assert isinstance(col.records, RecordBuffer)
+        assert col.records.array.dtype == np.int32
+
 
 class TestAgentCollector:
 
@@ -53,6 +90,7 @@ class TestAgentCollector:
         assert col.agentFunc is dummyFunc
         assert col.compositeFunc is None
         assert not col.includeTimestep
+        assert not col.vectorized
 
         # Test explicit values
 
@@ -141,6 +179,87 @@ class TestAgentCollector:
         assert len(collector.records) == 1
         assert collector.records[0] == {'value': 1}
 
+        # Test agentFunc being None only records the composite data
+        collector.agentFunc = None
+
+        collector.execute()
+
+        assert len(collector.records) == 2
+        assert collector.records[1] == {'value': 1}
+
+    def test_Collect_vectorized(self):
+
+        calls = []
+
+        def vectorizedFunc(agents):
+            calls.append(len(agents))
+            return np.arange(len(agents)) * 2
+
+        model = Model()
+        collector = AgentCollector(model, vectorizedFunc, vectorized=True)
+        assert collector.vectorized
+
+        # Test empty environment case works without calling agentFunc
+        collector.execute()
+        assert len(collector.records) == 0
+        assert len(calls) == 0
+
+        model.environment.add_agent(Agent("a1", model))
+        model.environment.add_agent(Agent("a2", model))
+
+        collector.execute()
+
+        # agentFunc is called once for all agents and NumPy results are stored as Python objects
+        assert calls == [2]
+        assert collector.records[0] == {'a1': 0, 'a2': 2}
+        assert type(collector.records[0]['a2']) is int
+
+        # None results are skipped
+        collector.agentFunc = lambda agents: [None, 5]
+        collector.execute()
+        assert collector.records[1] == {'a2': 5}
+
+        # There must be exactly one result per agent
+        collector.agentFunc = lambda agents: np.array([1])
+        with pytest.raises(ValueError):
+            collector.execute()
+        collector.agentFunc = lambda agents: [1, 2, 3]
+        with pytest.raises(ValueError):
+            collector.execute()
+        assert len(collector.records) == 2
+
+    def test_Collect_columnar(self):
+
+        model = Model()
+        pytest.raises(ValueError, AgentCollector, model, len, columnar=True)
+
+        collector = AgentCollector(model, lambda agents: np.arange(len(agents)) * 2, includeTimstep=True,
+                                   vectorized=True, columnar=True)
+        assert collector.columnar
+
+        # Test empty environment case only records the timestep
+        collector.execute()
+        assert collector.records[0] == {'timestep': 0}
+
+        model.environment.add_agent(Agent("a1", model))
+        model.environment.add_agent(Agent("a2", model))
+        model.systems.timestep = 1
+        collector.execute()
+
+        record = collector.records[1]
+        assert record['timestep'] == 1
+        np.testing.assert_array_equal(record['ids'], ['a1', 'a2'])
+        np.testing.assert_array_equal(record['values'], [0, 2])
+
+        # There must be exactly one result per agent
+        collector.agentFunc = lambda agents: np.array([1, 2, 3])
+        with pytest.raises(ValueError):
+            collector.execute()
+        collector.agentFunc = lambda agents: 1
+        with pytest.raises(ValueError):
+            collector.execute()
+        assert len(collector.records) == 2
+
 
 class TestFileCollector:
 
@@ -196,8 +315,20 @@ class TestFileCollector:
         m.assert_called_once_with(col.filename, col.filemode)
         handle = m()
 
-        handle.write.assert_any_call(4)
-        handle.write.assert_any_call(6)
+        handle.writelines.assert_called_once_with([4, 6])
+        handle.write.assert_not_called()
+
+    def test__write_records_dtype(self, tmp_path):
+        model = Model()
+        filename = str(tmp_path / 'records.bin')
+        col = FileCollector("Collector", model, filename, filemode='ab', dtype=np.int64)
+
+        col.records.append(4)
+        col.records.append(6)
+        col.write_records()
+        col.write_records()
+
+        assert np.fromfile(filename, dtype=np.int64).tolist() == [4, 6, 4, 6]
 
     def test__execute(self):
 
@@ -226,8 +357,7 @@ class TestFileCollector:
 
             m.assert_called_once_with(col.filename, col.filemode)
             handle = m()
-            handle.write.assert_any_call(4)
-            handle.write.assert_any_call(6)
+            handle.writelines.assert_called_once_with([4, 6])
 
             assert col.last_write == 0
             assert col.records == [4, 6]
@@ -235,13 +365,14 @@ class TestFileCollector:
         # Test write to file and clear records
         col.clear_records_on_write = True
         m = mock_open()
+        # The records list is cleared after it is written, so capture what was written
+        written = []
+        m.return_value.writelines.side_effect = written.extend
         with patch("builtins.open", m, create=True):
             col.execute()
 
             m.assert_called_once_with(col.filename, col.filemode)
-            handle = m()
-            handle.write.assert_any_call(4)
-            handle.write.assert_any_call(6)
+            assert written == [4, 6]
 
             assert col.last_write == 0
             assert col.records == []
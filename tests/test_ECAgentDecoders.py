@@ -1,7 +1,10 @@
+import json
+import sys
 import pytest
 
 from ECAgent.Core import *
 from ECAgent.Decode import *
+from ECAgent.Environments import SpaceWorld, PositionComponent
 
 
 class TestIDecodable:
@@ -11,6 +14,13 @@ class TestIDecodable:
         with pytest.raises(NotImplementedError):
             IDecodable.decode({})
 
+    def test_decode_batch(self):
+        model = Model(seed=0)
+        agents = DummyAgent.decode_batch({'id_prefix': 'a', 'model': model}, 3)
+
+        assert [agent.id for agent in agents] == ['a0', 'a1', 'a2']
+        assert all(0 <= agent[DummyComponent].wealth < 10 for agent in agents)
+
 
 class DummyClass:
     int = 1
@@ -62,7 +72,7 @@ class DummySystem(System, IDecodable):
         super(DummySystem, self).__init__(id, model, priority, frequency, start, end)
 
     def execute(self):
-        print(self.model.systems.timestep)
+        self.model.logger.debug(self.model.systems.timestep)
 
     @staticmethod
     def decode(params: dict):
@@ -74,7 +84,7 @@ class DummyComponent(Component):
     def __init__(self, agent, model, wealth):
         super().__init__(agent, model)
 
-        self.wealth = model.random.randrange(0,10)
+        self.wealth = wealth
 
 
 class DummyAgent(Agent, IDecodable):
@@ -85,7 +95,41 @@ class DummyAgent(Agent, IDecodable):
 
     @staticmethod
     def decode(params: dict):
-        return DummyAgent(params['id_prefix'] + str(params['agent_index']), params['model'], 0)
+        return DummyAgent(params['id_prefix'] + str(params['agent_index']), params['model'],
+                          params['model'].random.randrange(0, 10))
+
+
+class BatchDummyAgent(DummyAgent):
+
+    @classmethod
+    def decode_batch(cls, params: dict, number: int) -> list:
+        # Draw every agent's wealth at once
+        model = params['model']
+        wealths = model.rng.integers(0, 10, size=number).tolist()
+        return [cls(params['id_prefix'] + str(i), model, wealths[i]) for i in range(number)]
+
+
+class SpaceDummyModel(Model, IDecodable):
+
+    def __init__(self):
+        super().__init__()
+        self.environment = SpaceWorld(self, 5, 5)
+
+    @staticmethod
+    def decode(params: dict):
+        return SpaceDummyModel()
+
+
+class CountingDummyAgent(Agent, IDecodable):
+
+    def __init__(self, id: str, model: Model):
+        super().__init__(id, model)
+        # The number of agents in the environment when this agent was decoded
+        self.preceding = len(model.environment)
+
+    @staticmethod
+    def decode(params: dict):
+        return CountingDummyAgent(params['id_prefix'] + str(params['agent_index']), params['model'])
 
 
 # Pre and post methods to be invoked by decoder
@@ -123,3 +167,63 @@ class TestJsonDecoder:
             assert model.environment.agents[agent].model is model
         assert 'pre_agent' in testDict
         assert 'post_agent' in testDict
+
+    def test_open_file(self, tmp_path):
+        decoder = JsonDecoder()
+
+        file_path = tmp_path / 'data.json'
+        file_path.write_text('{"model": {"name": "Model", "params": {"seed": 1}}, "agents": []}')
+        assert decoder.open_file(str(file_path)) == {'model': {'name': 'Model', 'params': {'seed': 1}}, 'agents': []}
+
+        # Values only supported by the json module are still decoded
+        file_path.write_text('{"value": NaN}')
+        value = decoder.open_file(str(file_path))['value']
+        assert value != value
+
+        # Agent param keys are interned
+        file_path.write_text('{"agents": [{"params": {"components": {"DummyComponent": {"wealth": 1}}}}]}')
+        params = decoder.open_file(str(file_path))['agents'][0]['params']
+        key = next(iter(params['components']))
+        assert key is sys.intern('DummyComponent')
+        assert next(iter(params['components'][key])) is sys.intern('wealth')
+
+        # The top-level value must be an object
+        for content in ('null', '[]'):
+            file_path.write_text(content)
+            with pytest.raises(Exception, match='Unable to open file'):
+                decoder.open_file(str(file_path))
+            with pytest.raises(Exception, match='Unable to open file'):
+                decoder.decode(str(file_path))
+
+    def test_decode_add_agent(self, tmp_path):
+        data = {
+            'model': {'name': 'SpaceDummyModel', 'module': 'test_ECAgentDecoders', 'params': {}},
+            'systems': [],
+            'agents': [{'name': 'CountingDummyAgent', 'module': 'test_ECAgentDecoders', 'number': 3,
+                        'params': {'id_prefix': 'c'}}]
+        }
+        file_path = tmp_path / 'space.json'
+        file_path.write_text(json.dumps(data))
+
+        model = JsonDecoder().decode(str(file_path))
+
+        # Agents are added using the environment's add_agent() one at a time
+        assert [agent.preceding for agent in model.environment] == [0, 1, 2]
+        assert all(PositionComponent in agent for agent in model.environment)
+
+    def test_decode_batch(self, tmp_path):
+        data = {
+            'model': {'name': 'DummyModel', 'module': 'test_ECAgentDecoders', 'params': {'seed': 1}},
+            'systems': [],
+            'agents': [{'name': 'BatchDummyAgent', 'module': 'test_ECAgentDecoders', 'number': 5,
+                        'params': {'id_prefix': 'b'}}]
+        }
+        file_path = tmp_path / 'batch.json'
+        file_path.write_text(json.dumps(data))
+
+        model = JsonDecoder().decode(str(file_path))
+
+        # The agent type's decode_batch() is used to create all of its agents
+        assert list(model.environment.agents) == ['b0', 'b1', 'b2', 'b3', 'b4']
+        assert [agent[DummyComponent].wealth for agent in model.environment] == \
+            Model(seed=1).rng.integers(0, 10, size=5).tolist()
@@ -1,3 +1,4 @@
+import copy
 import numpy as np
 import pytest
 
@@ -230,9 +231,140 @@ class TestSpaceWorld:
         with pytest.raises(AgentNotFoundError):
             model.environment.remove_agent(agent.id)
 
-    def test_get_agents_at(self):
+    def test_positions(self):
         model = Model()
-        model.environment = DiscreteWorld(model, 5, 5, 5)
+        model.environment = SpaceWorld(model, 5, 5, 5)
+        agents = [Agent(f"a{i}", model) for i in range(3)]
+        for i, agent in enumerate(agents):
+            model.environment.add_agent(agent, i, i, i)
+
+        # Without soa, the positions are a read-only copy of the agents' coordinates
+        assert model.environment.positions.tolist() == [[0, 0, 0], [1, 1, 1], [2, 2, 2]]
+        assert model.environment.position_agents == agents
+        with pytest.raises(ValueError):
+            model.environment.positions[:, 0] += 0.5
+        assert type(agents[1][PositionComponent]) is PositionComponent
+
+        model = Model()
+        model.environment = SpaceWorld(model, 5, 5, 5, soa=True)
+        agents = [Agent(f"a{i}", model) for i in range(3)]
+        for i, agent in enumerate(agents):
+            model.environment.add_agent(agent, i, i, i)
+
+        # Rows hold the coordinates of the agents' PositionComponents
+        assert model.environment.positions.tolist() == [[0, 0, 0], [1, 1, 1], [2, 2, 2]]
+        assert model.environment.position_agents == agents
+
+        # Writing to the array moves the agents and vice versa
+        model.environment.positions[:, 0] += 0.5
+        assert agents[2][PositionComponent].xyz() == (2.5, 2, 2)
+        agents[1][PositionComponent].y = 4.0
+        assert model.environment.positions[1, 1] == 4.0
+
+        # Removing an agent moves the last row into the vacated one and keeps the removed agent's position
+        component = agents[0][PositionComponent]
+        model.environment.remove_agent(agents[0].id)
+        assert model.environment.position_agents == [agents[2], agents[1]]
+        assert model.environment.positions.tolist() == [[2.5, 2, 2], [1.5, 4, 1]]
+        assert component.xyz() == (0.5, 0, 0)
+        assert type(component) is PositionComponent
+
+        # The array grows as agents are added
+        for i in range(3, 2000):
+            model.environment.add_agent(Agent(f"a{i}", model), 1, 1, 1)
+        assert len(model.environment.positions) == 1999
+        assert agents[2][PositionComponent].xyz() == (2.5, 2, 2)
+
+        # Copies share their own positions array
+        clone = copy.deepcopy(model)
+        clone_component = clone.environment.agents["a2"][PositionComponent]
+        clone_component.x = 0.0
+        assert clone.environment.positions[0, 0] == 0.0
+        assert agents[2][PositionComponent].x == 2.5
+
+    def test_positions_dtype(self):
+        model = Model()
+        model.environment = SpaceWorld(model, 5, 5, position_dtype=np.float32, soa=True)
+        agent = Agent("a1", model)
+        model.environment.add_agent(agent, 1, 2)
+
+        assert model.environment.positions.dtype == np.float32
+        model.environment.move(agent, 0.5, 0.25)
+        assert agent[PositionComponent].xyz() == (1.5, 2.25, 0.0)
+
+    @pytest.mark.parametrize('soa', [False, True])
+    def test_positions_discrete(self, soa):
+        model = Model()
+        model.environment = DiscreteWorld(model, 5, 5, 5, soa=soa)
+        agent = Agent("a1", model)
+        model.environment.add_agent(agent, 1, 2, 3)
+
+        if soa:
+            # Discrete worlds store integer coordinates, so fractional coordinates are rejected
+            with pytest.raises(ValueError):
+                agent[PositionComponent].x = 3.7
+            with pytest.raises(ValueError):
+                model.environment.move(agent, 0, 0.5)
+            with pytest.raises(ValueError):
+                model.environment.add_agent(Agent("a2", model), 1.5, 2, 3)
+            with pytest.raises(ValueError):
+                model.environment.add_agents([Agent("a3", model)], np.array([[1.5, 2, 3]]))
+            assert len(model.environment) == 1
+            assert agent[PositionComponent].xyz() == (1, 2, 3)
+
+            # Whole floats are accepted
+            agent[PositionComponent].x = 3.0
+            assert agent[PositionComponent].xyz() == (3, 2, 3)
+            assert type(agent[PositionComponent].x) is int
+        else:
+            # Fractional coordinates are not truncated
+            agent[PositionComponent].x = 3.7
+            assert agent[PositionComponent].xyz() == (3.7, 2, 3)
+            model.environment.move(agent, 0, 0.5)
+            assert agent[PositionComponent].xyz() == (3.7, 2.5, 3)
+            assert model.environment.positions.tolist() == [[3.7, 2.5, 3]]
+
+    @pytest.mark.parametrize('soa', [False, True])
+    def test_add_agents(self, soa):
+        model = Model()
+        model.environment = DiscreteWorld(model, 5, 5, 5, soa=soa)
+        model.environment.add_agent(Agent("a0", model), 4, 4, 4)
+
+        # Test default positions
+        agents = [Agent("a1", model), Agent("a2", model)]
+        model.environment.add_agents(agents)
+        assert [agent[PositionComponent].xyz() for agent in agents] == [(0, 0, 0), (0, 0, 0)]
+
+        # Test given positions (enough agents to grow the positions array)
+        agents = [Agent(f"b{i}", model) for i in range(2000)]
+        positions = np.tile([1, 2, 3], (2000, 1))
+        positions[-1] = [4, 3, 2]
+        model.environment.add_agents(agents, positions)
+        assert len(model.environment.positions) == 2003
+        assert agents[0][PositionComponent].xyz() == (1, 2, 3)
+        assert agents[-1][PositionComponent].xyz() == (4, 3, 2)
+        assert model.environment.get_agent("a0")[PositionComponent].xyz() == (4, 4, 4)
+        assert model.environment.get_agents_at(4, 3, 2) == [agents[-1]]
+
+        # Test invalid shape
+        with pytest.raises(ValueError):
+            model.environment.add_agents([Agent("c1", model)], [[0, 0]])
+
+        # Test out of bounds positions
+        with pytest.raises(Exception):
+            model.environment.add_agents([Agent("c1", model), Agent("c2", model)], [[0, 0, 0], [5, 0, 0]])
+        assert model.environment.get_agent("c1") is None
+
+        # Test duplicate agents
+        with pytest.raises(DuplicateAgentError):
+            model.environment.add_agents([Agent("c1", model), Agent("a1", model)])
+        assert model.environment.get_agent("c1") is None
+        assert len(model.environment.positions) == 2003
+
+    @pytest.mark.parametrize('soa', [False, True])
+    def test_get_agents_at(self, soa):
+        model = Model()
+        model.environment = DiscreteWorld(model, 5, 5, 5, soa=soa)
         agent = Agent("a1", model)
         agent2 = Agent("a2", model)
 
@@ -254,6 +386,16 @@ class TestSpaceWorld:
         # Test Greater than Leeway case
         assert model.environment.get_agents_at(0, 0, 0, 2, 1, 1, 1) == [agent, agent2]
 
+        # Test agents are returned in the order they were added after rows are swapped by remove_agent
+        agent3 = Agent("a3", model)
+        model.environment.add_agent(agent3, 1, 1, 1)
+        model.environment.add_agents([Agent("a4", model)], [[4, 4, 4]])
+        model.environment.remove_agent("a1")
+        if soa:
+            assert model.environment.position_agents == [model.environment.get_agent("a4"), agent2, agent3]
+        assert model.environment.get_agents_at(1, 1, 1, 1) == [agent2, agent3]
+        assert model.environment.get_agents_at(2, 2, 2, 2) == [agent2, agent3, model.environment.get_agent("a4")]
+
     def test_get_dimensions(self):
         env = SpaceWorld(Model(), 1, 2, 3)
         assert env.get_dimensions() == (1, 2, 3)
@@ -828,6 +970,20 @@ class TestGridWorld:
             for y in range(5):
                 assert env.cells['pos'][discrete_grid_pos_to_id(x, y, 5)] == (x, y, 0)
 
+    def test_soa(self):
+        model = Model()
+        model.environment = GridWorld(model, 5, 5, soa=True)
+        agent = Agent("a1", model)
+        model.environment.add_agent(agent, 1, 2)
+        position = agent[PositionComponent]
+
+        assert type(position.x) is int and type(position.y) is int
+        assert discrete_grid_pos_to_id(position.x, position.y, 5) == 11
+        assert model.environment.get_moore_neighbours(position.xyz()) == \
+            GridWorld(Model(), 5, 5).get_moore_neighbours((1, 2, 0))
+        assert model.environment.get_neumann_neighbours(position.xyz()) == \
+            GridWorld(Model(), 5, 5).get_neumann_neighbours((1, 2, 0))
+
     def test_get_dimensions(self):
         env = GridWorld(Model(), 3, 5)
         assert env.get_dimensions() == (3,5)